@@ -0,0 +1,19 @@
+"""Settings profiles.
+
+base  -- everything shared by the profiles below
+dev   -- DEBUG, debug_toolbar and media served by Django (manage.py default)
+prod  -- lean production profile (wsgi.py / asgi.py default)
+
+Pick one with DJANGO_SETTINGS_MODULE=event_management.settings.<profile>.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+# This package used to be a single settings module; pointing at it now would
+# load no settings at all.
+if os.environ.get("DJANGO_SETTINGS_MODULE") == __name__:
+    raise ImproperlyConfigured(
+        f"DJANGO_SETTINGS_MODULE={__name__} names the settings package; "
+        f"use {__name__}.prod or {__name__}.dev."
+    )
@@ -0,0 +1,224 @@
+"""
+Django settings for event_management project.
+
+Generated by 'django-admin startproject' using Django 5.2.7.
+
+Settings shared by every environment; event_management.settings.dev and
+event_management.settings.prod build on this module.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.2/ref/settings/
+"""
+
+from pathlib import Path
+from decouple import config # type: ignore
+
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = config('SECRET_KEY')
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    "127.0.0.1",
+    "localhost",
+    "*",
+]
+CSRF_TRUSTED_ORIGINS =['https://new-event-managment.onrender.com', 'http://127.0.0.1:8000']
+
+AUTH_USER_MODEL= 'users.CustomUser'
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'events',
+    'users',
+]
+
+MIDDLEWARE = [
+    'events.profiling.RequestProfilingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'event_management.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'events.profiling.ProfilingDjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'events.context_processors.user_roles',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'event_management.wsgi.application'
+
+
+
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        # Writers wait up to `timeout` seconds for the lock instead of
+        # failing with "database is locked". Only the blocks that need it
+        # take the lock up front (events.locking).
+        'OPTIONS': {
+            'timeout': 20,
+        },
+        # A file rather than the default shared-cache in-memory database,
+        # whose table locks fail at once instead of waiting; the RSVP
+        # concurrency tests run several connections at the same time.
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    }
+}
+
+
+# Role lookups (users.roles) and the home page event grid (events.fragments)
+# are cached here. Run several worker processes against a shared backend
+# such as Redis or Memcached so invalidations reach all of them.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'event-management',
+    }
+}
+
+# Seconds a user's group names stay in the cache (see users.roles).
+ROLE_CACHE_TIMEOUT = 60 * 60
+# Upper bound for a cached home grid; edits invalidate it immediately anyway.
+HOME_GRID_CACHE_TIMEOUT = 60 * 10
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'Asia/Dhaka'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+
+STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STATICFILES_DIRS= [
+    BASE_DIR / 'static',
+]
+
+# Shared by every profile, so collectstatic builds the hashed manifest
+# whichever settings it runs under. With DEBUG on, {% static %} keeps the
+# plain names and runserver serves them as before.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "event_management.storage.StaticFilesStorage",
+    },
+}
+WHITENOISE_MANIFEST_STRICT = False
+
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+
+
+# Mail is queued in users.OutgoingEmail and sent by `manage.py send_queued_mail`;
+# set EMAIL_BACKEND to the console or locmem backend to run the worker locally.
+EMAIL_BACKEND = config("EMAIL_BACKEND", default="sendgrid_backend.SendgridBackend")
+SENDGRID_API_KEY = config("SENDGRID_API_KEY")
+SENDGRID_SANDBOX_MODE_IN_DEBUG = config(
+    "SENDGRID_SANDBOX_MODE_IN_DEBUG", default=False, cast=bool
+)
+DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL")
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_BACKOFF_SECONDS = 30
+
+
+
+
+FRONTEND_URL = 'https://new-event-managment.onrender.com'
+
+
+LOGIN_URL = 'sign-in'
+
+# Views decorated with events.profiling.query_budget raise when they go over
+# budget in development and only log a warning otherwise.
+QUERY_BUDGET_RAISE = False
+
+# events.profiling.RequestProfilingMiddleware: fraction of requests to
+# profile (0 disables it), whether to expose the numbers in a Server-Timing
+# header, and how often one SQL shape may repeat before it is logged as N+1.
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0.0, cast=float)
+PROFILING_SERVER_TIMING = config("PROFILING_SERVER_TIMING", default=True, cast=bool)
+PROFILING_N_PLUS_ONE_THRESHOLD = 10
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "events.profiling": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
+
+# Resize uploaded event images on a background thread (see events.images).
+EVENT_IMAGE_ASYNC = True
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""Development settings: DEBUG, debug_toolbar and strict query budgets."""
+
+from .base import *  # noqa: F401,F403
+
+
+DEBUG = True
+
+INSTALLED_APPS += [
+    "debug_toolbar",
+]
+
+MIDDLEWARE += [
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+]
+
+INTERNAL_IPS= [
+    #...
+    "127.0.0.1",
+    #...
+]
+
+QUERY_BUDGET_RAISE = True
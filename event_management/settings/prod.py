@@ -0,0 +1,54 @@
+"""Production settings.
+
+Compared to dev: no debug_toolbar, templates compiled once per process,
+and database connections reused across requests.
+
+manage.py defaults to the dev profile, so on a server export
+DJANGO_SETTINGS_MODULE=event_management.settings.prod (or pass
+--settings=event_management.settings.prod) before running migrate,
+collectstatic or check.
+
+Static files are served by WhiteNoise from STATIC_ROOT, so every deploy
+runs `manage.py collectstatic --noinput` first; `manage.py check --deploy`
+fails (events.E001) while the manifest is missing. The collected files
+carry content hashes in their names and go out with a one-year, immutable
+Cache-Control header. Uploaded media is served by Django itself unless
+SERVE_MEDIA is turned off for a web server or CDN in front.
+"""
+
+from decouple import Csv, config  # type: ignore
+
+from .base import *  # noqa: F401,F403
+
+
+DEBUG = config("DEBUG", default=False, cast=bool)
+
+ALLOWED_HOSTS = config("ALLOWED_HOSTS", default=",".join(ALLOWED_HOSTS), cast=Csv())
+
+# Keep connections open between requests instead of reconnecting each time.
+CONN_MAX_AGE = config("CONN_MAX_AGE", default=600, cast=int)
+DATABASES["default"]["CONN_MAX_AGE"] = CONN_MAX_AGE
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    ("django.template.loaders.cached.Loader", [
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]),
+]
+
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+)
+
+# Hashed names get max-age of a year and "immutable" from WhiteNoise; this
+# covers the few files referenced without {% static %}.
+WHITENOISE_MAX_AGE = 60 * 60
+# Before collectstatic has run, {% static %} falls back to the plain name
+# (see event_management.storage) and those files are found in place.
+WHITENOISE_USE_FINDERS = True
+
+SERVE_MEDIA = config("SERVE_MEDIA", default=True, cast=bool)
+MEDIA_MAX_AGE = config("MEDIA_MAX_AGE", default=60 * 60 * 24, cast=int)
@@ -0,0 +1,15 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Hashed, compressed static files; plain names until collectstatic has run.
+
+    Without a manifest the stock storage fails every {% static %} tag, and so
+    every page. Falling back lets WhiteNoise serve the files from the app
+    static directories (WHITENOISE_USE_FINDERS) until the next deploy.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
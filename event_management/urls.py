@@ -15,10 +15,10 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
-from debug_toolbar.toolbar import debug_toolbar_urls
+from django.urls import path, re_path, include
+from django.views.decorators.cache import cache_control
 from django.views.generic import RedirectView
-from django.conf.urls.static import static
+from django.views.static import serve
 from django.conf import settings
 
 
@@ -26,10 +26,27 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('events/', include('events.urls')),
     path('users/', include("users.urls")),
+    path('api/', include('events.api_urls')),
     path('', RedirectView.as_view(url='/events/home/', permanent=False)),
     
-]+ debug_toolbar_urls()
+]
 
 
+if settings.DEBUG:
+    from django.conf.urls.static import static
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+elif getattr(settings, "SERVE_MEDIA", False):
+    # Uploaded event images in production, cacheable for MEDIA_MAX_AGE.
+    urlpatterns += [
+        re_path(
+            rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.*)$",
+            cache_control(max_age=settings.MEDIA_MAX_AGE)(serve),
+            {"document_root": settings.MEDIA_ROOT},
+        ),
+    ]
+
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+
+    urlpatterns += debug_toolbar_urls()
\ No newline at end of file
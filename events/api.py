@@ -0,0 +1,271 @@
+"""JSON API over events, categories and RSVPs.
+
+Everything is serialized from values() rows, never model instances. Reads
+carry validators, so clients that poll can revalidate almost for free:
+
+- The event list uses an ETag made from the query string and one
+  aggregate over the filtered events: their count and latest updated_at.
+  Edits, RSVPs and category renames all move updated_at (see
+  events.signals). The upcoming and past lists also change when an event
+  starts, so their ETag includes the start of the next one. A 304 costs
+  one or two indexed queries, and every process computes the same ETag.
+- The category list is small; its ETag is a digest of the rows.
+- A single event uses an ETag and Last-Modified built from
+  Event.updated_at, which edits, RSVP changes and new image variants all
+  move. A 304 costs one primary-key lookup. The same validators make
+  If-Match work on PUT, PATCH and DELETE.
+
+Writes use the logged-in user's session (with the usual CSRF token) and the
+same permissions as the HTML views.
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max
+from django.forms.models import model_to_dict
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import condition, require_http_methods
+
+from events import rsvp
+from events.filters import apply_event_filters
+from events.forms import CategoryModelForm, EventApiForm
+from events.fragments import query_digest
+from events.models import Category, Event
+from events.pagination import InvalidCursor, json_page, paginate
+from events.timeline import Timeline
+
+EVENT_FIELDS = (
+    "id", "name", "description", "date", "time", "location", "category_id", "category__name",
+    "participant_count", "capacity", "asset", "updated_at",
+)
+CATEGORY_FIELDS = ("id", "name", "description")
+EVENT_ORDERING = ("date", "time", "id")
+# Query string parameters the event list reads.
+EVENT_LIST_PARAMS = ("type", "category", "start_date", "end_date", "after", "before")
+
+
+def error(status, message, **extra):
+    return JsonResponse({"error": message, **extra}, status=status)
+
+
+def api_login_required(view_func):
+    """Like login_required, but answers 401 instead of redirecting."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return error(401, "Authentication required.")
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def api_permission_required(perm):
+    def decorator(view_func):
+        @wraps(view_func)
+        @api_login_required
+        def wrapper(request, *args, **kwargs):
+            if not request.user.has_perm(perm):
+                return error(403, "You do not have permission to do that.")
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def serialize_event(row):
+    row = dict(row)
+    row["category"] = {"id": row.pop("category_id"), "name": row.pop("category__name")}
+    row["asset"] = default_storage.url(row["asset"]) if row["asset"] else None
+    capacity = row["capacity"]
+    row["seats_left"] = None if capacity is None else max(capacity - row["participant_count"], 0)
+    return row
+
+
+def _payload(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _invalid(form):
+    return error(400, "Invalid data.", fields=form.errors.get_json_data())
+
+
+def _event_json(event_id, status=200):
+    row = Event.objects.values(*EVENT_FIELDS).get(pk=event_id)
+    response = JsonResponse(serialize_event(row), status=status)
+    response["ETag"] = f'"{_event_etag_value(event_id, row["updated_at"])}"'
+    return response
+
+
+# Events
+
+def _digest(value):
+    return hashlib.md5(repr(value).encode(), usedforsecurity=False).hexdigest()
+
+
+def _list_timeline(request):
+    # The ETag and the list it describes are computed against the same moment.
+    if not hasattr(request, "_timeline"):
+        request._timeline = Timeline()
+    return request._timeline
+
+
+def _list_etag(request):
+    timeline = _list_timeline(request)
+    events = apply_event_filters(Event.objects.all(), request.GET, timeline)
+    state = events.aggregate(count=Count("id"), latest=Max("updated_at"))
+    parts = [state["count"], state["latest"]]
+    if request.GET.get("type") in ("upcoming", "past"):
+        # Both lists stay the same until the next event starts.
+        untyped = apply_event_filters(Event.objects.all(), {**request.GET.dict(), "type": "all"}, timeline)
+        parts.append(
+            untyped.filter(timeline.upcoming()).order_by("date", "time").values_list("date", "time").first()
+        )
+    return f"{query_digest(request.GET, EVENT_LIST_PARAMS)}-{_digest(parts)}"
+
+
+@condition(etag_func=_list_etag)
+def _list_events(request):
+    events = apply_event_filters(Event.objects.values(*EVENT_FIELDS), request.GET, _list_timeline(request))
+    after = request.GET.get("after") or None
+    before = request.GET.get("before") or None
+    try:
+        page = paginate(events, EVENT_ORDERING, after=after, before=before)
+    except InvalidCursor:
+        return error(400, "Invalid cursor.")
+    return json_page(page, serialize_event)
+
+
+@api_permission_required("events.add_event")
+def _create_event(request):
+    data = _payload(request)
+    if data is None:
+        return error(400, "Expected a JSON object.")
+    form = EventApiForm(data)
+    if not form.is_valid():
+        return _invalid(form)
+    event = form.save()
+    response = _event_json(event.pk, status=201)
+    response["Location"] = reverse("api-event", args=[event.pk])
+    return response
+
+
+@require_http_methods(["GET", "HEAD", "POST"])
+def events_collection(request):
+    if request.method == "POST":
+        return _create_event(request)
+    return _list_events(request)
+
+
+def _event_updated_at(request, id):
+    # Shared by the ETag and Last-Modified functions: one query per request.
+    if not hasattr(request, "_event_updated_at"):
+        request._event_updated_at = (
+            Event.objects.filter(pk=id).values_list("updated_at", flat=True).first()
+        )
+    return request._event_updated_at
+
+
+def _event_etag_value(id, updated_at):
+    return f"{id}-{updated_at.timestamp():.6f}"
+
+
+def _event_etag(request, id):
+    updated_at = _event_updated_at(request, id)
+    return _event_etag_value(id, updated_at) if updated_at else None
+
+
+@require_http_methods(["GET", "HEAD", "PUT", "PATCH", "DELETE"])
+@condition(etag_func=_event_etag, last_modified_func=_event_updated_at)
+def event_resource(request, id):
+    if _event_updated_at(request, id) is None:
+        return error(404, "Event not found.")
+    if request.method in ("GET", "HEAD"):
+        return _event_json(id)
+    if request.method == "DELETE":
+        return _delete_event(request, id)
+    return _update_event(request, id)
+
+
+@api_permission_required("events.change_event")
+def _update_event(request, id):
+    data = _payload(request)
+    if data is None:
+        return error(400, "Expected a JSON object.")
+    event = Event.objects.get(pk=id)
+    if request.method == "PATCH":
+        data = {**model_to_dict(event, fields=EventApiForm._meta.fields), **data}
+    form = EventApiForm(data, instance=event)
+    if not form.is_valid():
+        return _invalid(form)
+    form.save()
+    # A raised capacity frees seats for the waitlist.
+    rsvp.promote_waitlist(id)
+    return _event_json(id)
+
+
+@api_permission_required("events.delete_event")
+def _delete_event(request, id):
+    Event.objects.filter(pk=id).delete()
+    return HttpResponse(status=204)
+
+
+# RSVPs
+
+@require_http_methods(["GET", "POST", "DELETE"])
+@api_login_required
+def event_rsvp(request, id):
+    try:
+        if request.method == "POST":
+            status = rsvp.rsvp(id, request.user)
+        elif request.method == "DELETE":
+            status = rsvp.cancel_rsvp(id, request.user)
+        else:
+            status = rsvp.rsvp_status(id, request.user)
+    except Event.DoesNotExist:
+        return error(404, "Event not found.")
+    position = None
+    if status in (rsvp.WAITLISTED, rsvp.ALREADY_WAITLISTED):
+        position = rsvp.waitlist_position(id, request.user)
+    return JsonResponse({"status": status, "waitlist_position": position})
+
+
+# Categories
+
+def _category_rows(request):
+    # Shared by the ETag and the response: one query per request.
+    if not hasattr(request, "_category_rows"):
+        request._category_rows = list(Category.objects.order_by("name").values(*CATEGORY_FIELDS))
+    return request._category_rows
+
+
+def _categories_etag(request):
+    return _digest(_category_rows(request))
+
+
+@condition(etag_func=_categories_etag)
+def _list_categories(request):
+    return JsonResponse({"results": _category_rows(request)})
+
+
+@api_permission_required("events.add_category")
+def _create_category(request):
+    data = _payload(request)
+    if data is None:
+        return error(400, "Expected a JSON object.")
+    form = CategoryModelForm(data)
+    if not form.is_valid():
+        return _invalid(form)
+    category = form.save()
+    return JsonResponse(model_to_dict(category, fields=CATEGORY_FIELDS), status=201)
+
+
+@require_http_methods(["GET", "HEAD", "POST"])
+def categories_collection(request):
+    if request.method == "POST":
+        return _create_category(request)
+    return _list_categories(request)
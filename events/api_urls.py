@@ -0,0 +1,9 @@
+from django.urls import path
+from events.api import events_collection, event_resource, event_rsvp, categories_collection
+
+urlpatterns = [
+    path("events/", events_collection, name="api-events"),
+    path("events/<int:id>/", event_resource, name="api-event"),
+    path("events/<int:id>/rsvp/", event_rsvp, name="api-event-rsvp"),
+    path("categories/", categories_collection, name="api-categories"),
+]
@@ -0,0 +1,228 @@
+"""Helpers shared by the benchmark and data generation commands.
+
+Benchmarks never touch the configured database: they run inside
+scratch_database(), which creates a throwaway test database. The seed_*
+functions fill a database with bulk_create in fixed-size batches so memory
+stays flat at any scale; `manage.py generate_data` uses them directly.
+"""
+import os
+import random
+import re
+import secrets
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, time as clock_time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.mail.backends import locmem
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from events.models import Category, Event
+from users.roles import ORGANIZER, PARTICIPANT
+
+WORDS = [
+    "music", "tech", "summit", "conference", "festival", "workshop", "meetup",
+    "art", "food", "film", "startup", "charity", "marathon", "book", "design",
+    "science", "gaming", "coffee", "yoga", "career", "photography", "comedy",
+]
+CITIES = [
+    "Dhaka", "Chittagong", "Sylhet", "Khulna", "Rajshahi", "Barisal",
+    "Rangpur", "Comilla", "Mymensingh", "Cox's Bazar",
+]
+
+
+@contextmanager
+def scratch_database():
+    """Point the default connection at a fresh test database for the block.
+
+    On SQLite that is a file named after the process in the temp directory
+    rather than the TEST NAME from settings, so a benchmark never clobbers
+    the database of a test run going on at the same time. Being a file,
+    every thread gets a normal connection with the usual locking. Outgoing
+    mail goes to the locmem backend so seeded users never receive real
+    emails.
+    """
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict["TEST"]
+    old_test_name = test_settings.get("NAME")
+    if connection.vendor == "sqlite":
+        test_settings["NAME"] = os.path.join(tempfile.gettempdir(), f"scratch-{os.getpid()}.sqlite3")
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        with override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend"):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = old_test_name
+
+
+class SlowEmailBackend(locmem.EmailBackend):
+    """locmem backend that pays a round-trip per call, like a remote provider."""
+
+    latency = 0.005
+
+    def open(self):
+        time.sleep(self.latency)
+        return True
+
+    def send_messages(self, messages):
+        time.sleep(self.latency)
+        return super().send_messages(messages)
+
+
+def timed(func, repeat):
+    """Call `func` `repeat` times and return the wall times in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def percentile(samples, pct):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+STARTUP_SCRIPT = (
+    "import event_management.wsgi\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def startup_imports(settings_module):
+    """Import the WSGI app and URLconf in a fresh interpreter under -X importtime.
+
+    Returns ({module: cumulative microseconds}, total microseconds).
+    """
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    imports = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            imports[match[4]] = int(match[2])
+            if not match[3]:
+                total += int(match[2])
+    return imports, total
+
+
+def seed_categories(count):
+    existing = Category.objects.count()
+    Category.objects.bulk_create(
+        Category(name=f"{WORDS[i % len(WORDS)].title()} {i}", description="")
+        for i in range(existing, count)
+    )
+    return list(Category.objects.values_list("id", flat=True))
+
+
+def seed_events(count, category_ids, batch_size=5000, days=730, seed=0):
+    """bulk_create `count` events spread over `days` days around today.
+
+    bulk_create skips post_save, so callers that need the search index must
+    rebuild it afterwards.
+    """
+    rng = random.Random(seed)
+    first_day = date.today() - timedelta(days=days // 2)
+    created_at = timezone.now()
+    remaining = count
+    while remaining > 0:
+        batch = []
+        for _ in range(min(batch_size, remaining)):
+            words = rng.sample(WORDS, 3)
+            batch.append(Event(
+                name=" ".join(words).title(),
+                description=f"A {words[0]} event about {words[1]} and {words[2]}.",
+                date=first_day + timedelta(days=rng.randrange(days)),
+                time=clock_time(rng.randrange(8, 23), rng.choice((0, 15, 30, 45))),
+                location=rng.choice(CITIES),
+                category_id=rng.choice(category_ids),
+                created_at=created_at,
+            ))
+        Event.objects.bulk_create(batch)
+        remaining -= len(batch)
+
+
+def seed_prefix():
+    """A username prefix unique to this run, e.g. "user-3fa9c2-"."""
+    return f"user-{secrets.token_hex(3)}-"
+
+
+def seed_users(count, organizer_ratio=0.02, batch_size=5000, password="password", prefix=None):
+    """bulk_create `count` active users, each in the Organizer or Participant group.
+
+    Usernames are `prefix` followed by 1..count; the default prefix is new
+    for every call, so repeated runs never collide with earlier users or
+    with real accounts named like user42. Every user gets the same
+    password, hashed once. bulk_create skips post_save, so no activation
+    emails are queued. Returns the new ids.
+    """
+    User = get_user_model()
+    organizers, _ = Group.objects.get_or_create(name=ORGANIZER)
+    participants, _ = Group.objects.get_or_create(name=PARTICIPANT)
+    Membership = User.groups.through
+    hashed = make_password(password)
+    if prefix is None:
+        prefix = seed_prefix()
+    every = max(1, round(1 / organizer_ratio)) if organizer_ratio else None
+
+    user_ids = []
+    for start in range(1, count + 1, batch_size):
+        batch = [
+            User(username=f"{prefix}{n}", email=f"{prefix}{n}@example.com", password=hashed, is_active=True)
+            for n in range(start, min(start + batch_size, count + 1))
+        ]
+        User.objects.bulk_create(batch)
+        ids = list(
+            User.objects.filter(username__in=[user.username for user in batch])
+            .order_by("id").values_list("id", flat=True)
+        )
+        # By position, so the first seeded user is always an organizer.
+        Membership.objects.bulk_create(
+            Membership(
+                customuser_id=user_id,
+                group_id=organizers.id if every and (n - 1) % every == 0 else participants.id,
+            )
+            for n, user_id in enumerate(ids, start)
+        )
+        user_ids.extend(ids)
+    return user_ids
+
+
+def seed_rsvps(count, user_ids, event_ids, batch_size=5000, seed=0):
+    """bulk_create about `count` random RSVPs and refresh participant_count.
+
+    Duplicate pairs are dropped by the unique constraint, so slightly fewer
+    rows than requested may be written. bulk_create skips m2m_changed, so no
+    confirmation emails are queued.
+    """
+    rng = random.Random(seed)
+    RSVP = Event.participants.through
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        RSVP.objects.bulk_create(
+            (
+                RSVP(event_id=rng.choice(event_ids), customuser_id=rng.choice(user_ids))
+                for _ in range(size)
+            ),
+            ignore_conflicts=True,
+        )
+        remaining -= size
+    Event.objects.recount_participants()
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_static_manifest(app_configs, **kwargs):
+    """Fail deploy checks when a manifest storage is configured but collectstatic has not run."""
+    if not hasattr(staticfiles_storage, "load_manifest") or settings.DEBUG:
+        return []
+    if staticfiles_storage.exists(staticfiles_storage.manifest_name):
+        return []
+    return [
+        Error(
+            "The static files manifest is missing, so pages link to unhashed static files.",
+            hint="Run `manage.py collectstatic --noinput --settings=event_management.settings.prod` "
+                 "as part of every deploy.",
+            id="events.E001",
+        )
+    ]
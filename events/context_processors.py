@@ -1,7 +1,10 @@
 # events/context_processors.py
+from users.roles import is_organizer
+
+
 def user_roles(request):
     user = request.user
     return {
-        'is_organizer': user.groups.filter(name='Organizer').exists(),
+        'is_organizer': is_organizer(user),
         'is_admin': user.is_superuser,
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,48 @@
+"""Streaming CSV exports.
+
+Rows come from values_list().iterator(chunk_size=EXPORT_CHUNK_SIZE), so the
+database hands them over in chunks instead of one big result list, and
+each line is written to the response as soon as it is formatted. The first
+bytes go out before the query has finished, and memory use stays the same
+for ten attendees or a hundred thousand.
+"""
+import csv
+
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Leading characters that make spreadsheet programs evaluate a cell.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([_cell(value) for value in row])
+
+
+def csv_response(filename, header, queryset):
+    """Stream `queryset` (a values_list()) as a CSV download."""
+    response = StreamingHttpResponse(
+        csv_lines(header, queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
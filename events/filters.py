@@ -0,0 +1,27 @@
+"""Event list filters shared by the organizer dashboard and the JSON API.
+
+apply_event_filters() reads the dashboard's query string parameters:
+`type` (all | upcoming | past), `category` and a `start_date`/`end_date`
+range. Malformed values are ignored rather than turned into errors.
+"""
+from django.utils.dateparse import parse_date
+
+from events.timeline import Timeline
+
+
+def apply_event_filters(events, params, timeline=None):
+    timeline = timeline or Timeline()
+    events = timeline.filter(events, params.get("type", "all"))
+
+    category_id = params.get("category", "")
+    if category_id.isdigit():
+        events = events.filter(category_id=category_id)
+
+    try:
+        start_date = parse_date(params.get("start_date", ""))
+        end_date = parse_date(params.get("end_date", ""))
+    except ValueError:
+        start_date = end_date = None
+    if start_date and end_date:
+        events = events.filter(date__range=[start_date, end_date])
+    return events
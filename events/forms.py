@@ -1,5 +1,8 @@
 from django import forms
+from django.contrib.auth import get_user_model
 from events.models import Event, Category
+from events.rsvp import change_participants
+from users.fields import UserPickerField
 
 
 # ---------------------------------
@@ -83,6 +86,18 @@ class StyledFormMixin:
 class EventModelForm(StyledFormMixin, forms.ModelForm):
     """Model-based Event Form with Tailwind styling."""
 
+    # Renders only the selected users; others are searched for on the page.
+    # Not in Meta.fields, so ModelForm neither loads every participant as
+    # initial data nor saves the list with participants.set(). The widget
+    # lists the current participants a page at a time and posts only the
+    # users added and removed.
+    participants = UserPickerField(
+        queryset=get_user_model().objects.all(), required=False, label="Participants",
+    )
+    field_order = [
+        'name', 'description', 'category', 'location', 'date', 'time', 'capacity', 'participants', 'asset',
+    ]
+
     class Meta:
         model = Event
         fields = [
@@ -92,20 +107,106 @@ class EventModelForm(StyledFormMixin, forms.ModelForm):
             'location',
             'date',
             'time',
-            'participants',
+            'capacity',
             'asset',
         ]
         widgets = {
             'description': forms.Textarea,
             'date': forms.DateInput(attrs={'type': 'date'}),
             'time': forms.TimeInput(attrs={'type': 'time'}),
-            'participants': forms.CheckboxSelectMultiple,
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['participants'].widget.event = self.instance
         self.apply_styled_widgets()
 
+    def _save_m2m(self):
+        super()._save_m2m()
+        # Only the posted change is applied, see change_participants().
+        change_participants(self.instance, **self.cleaned_data['participants'])
+
+
+# ---------------------------------
+# Event form for the JSON API
+# ---------------------------------
+class EventApiForm(forms.ModelForm):
+    """Event fields writable through events.api; participants go through RSVPs."""
+
+    class Meta:
+        model = Event
+        fields = [
+            'name',
+            'description',
+            'category',
+            'location',
+            'date',
+            'time',
+            'capacity',
+        ]
+
+
+# ---------------------------------
+# Event form for bulk imports
+# ---------------------------------
+class CategoryNameField(forms.Field):
+    """Category given by name, resolved through a preloaded {name: id} map."""
+
+    default_error_messages = {
+        "invalid_choice": "Unknown category %(value)s.",
+    }
+
+    def __init__(self, *args, **kwargs):
+        self.category_ids = {}
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        value = str(value or "").strip()
+        if not value:
+            return None
+        try:
+            return self.category_ids[value]
+        except KeyError:
+            raise forms.ValidationError(
+                self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value},
+            )
+
+
+class EventImportForm(forms.ModelForm):
+    """Field rules for one imported row, derived from the model like EventModelForm.
+
+    The category column holds a name; `categories` maps names to ids so no
+    row costs a query. events.importing runs these fields directly instead
+    of binding a form per row.
+    """
+
+    category = CategoryNameField()
+
+    class Meta:
+        model = Event
+        fields = [
+            'name',
+            'description',
+            'category',
+            'location',
+            'date',
+            'time',
+            'capacity',
+        ]
+
+    def __init__(self, *args, categories, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['category'].category_ids = categories
+
+
+class EventImportUploadForm(StyledFormMixin, forms.Form):
+    file = forms.FileField(
+        label="CSV or JSON file",
+        help_text="Columns: name, description, category, location, date, time, capacity.",
+    )
+    dry_run = forms.BooleanField(required=False, label="Only validate, do not import")
+
 
 # # ---------------------------------
 # # Django Model Form for Participant
@@ -0,0 +1,44 @@
+"""Cached HTML fragments for the public event pages.
+
+Every cached fragment key includes the events "generation", a counter in
+the default cache that the receivers in events.signals bump whenever an
+event, a category or an event's participants change. Bumping it orphans all
+previously cached fragments at once, so edits show up on the next request
+without tracking which pages they appear on.
+"""
+import hashlib
+
+from django.core.cache import cache
+
+GENERATION_KEY = "events:generation"
+
+
+def events_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, 1, timeout=None)
+        generation = cache.get(GENERATION_KEY, 1)
+    return generation
+
+
+def bump_events_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 2, timeout=None)
+
+
+def query_digest(params, names=None):
+    """md5 of the query dict `params`, keys sorted and limited to `names` if given."""
+    keys = sorted(params if names is None else set(names) & set(params))
+    query = "&".join(
+        f"{key}={value}"
+        for key in keys
+        for value in params.getlist(key)
+    )
+    return hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+
+
+def fragment_key(name, params, names=None):
+    """Cache key for fragment `name` rendered for the query dict `params`."""
+    return f"events:{name}:{events_generation()}:{query_digest(params, names)}"
@@ -0,0 +1,103 @@
+"""Resized variants of uploaded event images.
+
+When an event's asset changes, process_event_image() renders it at each
+width in VARIANT_WIDTHS as WebP and JPEG, stores the files under
+events_asset/variants/ with names derived from a hash of the source bytes
+(so identical uploads share files and URLs can be cached forever) and
+records them in Event.asset_variants. The work runs after the transaction
+commits on a small thread pool, so the upload request never waits for
+Pillow; `manage.py generate_event_images` does the same for existing rows.
+
+The event_images template tags turn asset_variants into srcset markup.
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from events.fragments import bump_events_generation
+from events.models import Event
+
+logger = logging.getLogger(__name__)
+
+VARIANT_WIDTHS = (160, 480, 960, 1200, 1800)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+VARIANT_DIR = "events_asset/variants"
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="event-images")
+
+
+def needs_variants(event):
+    return bool(event.asset) and event.asset_variants.get("source") != event.asset.name
+
+
+def render_variants(source_name):
+    """Write every variant of `source_name`; returns the asset_variants dict."""
+    # Imported here so Pillow stays out of process startup.
+    from PIL import Image, ImageOps
+
+    with default_storage.open(source_name, "rb") as source:
+        data = source.read()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+
+    image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    # Never upscale: a source narrower than every width gets one variant at its own size.
+    widths = [w for w in VARIANT_WIDTHS if w <= image.width] or [image.width]
+    variants = {"source": source_name, **{fmt: {} for fmt in FORMATS}}
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt, (pil_format, options) in FORMATS.items():
+            name = f"{VARIANT_DIR}/{digest}-{width}w.{fmt}"
+            if not default_storage.exists(name):
+                buffer = BytesIO()
+                resized.save(buffer, pil_format, **options)
+                name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            variants[fmt][str(width)] = name
+    return variants
+
+
+def process_event_image(event_id):
+    event = Event.objects.filter(pk=event_id).only("asset", "asset_variants").first()
+    if event is None or not needs_variants(event):
+        return
+    try:
+        variants = render_variants(event.asset.name)
+    except Exception:
+        logger.exception("Could not generate image variants for event %s", event_id)
+        return
+    # Only record them if the asset was not replaced in the meantime.
+    updated = Event.objects.filter(pk=event_id, asset=event.asset.name).update(
+        asset_variants=variants, updated_at=timezone.now(),
+    )
+    if updated:
+        bump_events_generation()
+
+
+def _process_in_background(event_id):
+    try:
+        process_event_image(event_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_event_image(event):
+    """Generate the event's variants once the current transaction commits."""
+    if not needs_variants(event):
+        return
+    if getattr(settings, "EVENT_IMAGE_ASYNC", True):
+        transaction.on_commit(lambda: _executor.submit(_process_in_background, event.pk))
+    else:
+        transaction.on_commit(lambda: process_event_image(event.pk))
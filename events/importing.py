@@ -0,0 +1,167 @@
+"""Bulk event import from CSV or JSON.
+
+Rows are read one at a time from the open file: csv.DictReader for CSV,
+and an incremental decoder for JSON that accepts either one array of
+objects or JSON Lines. Memory use therefore does not grow with the file.
+Each row is validated with the fields of EventImportForm, which are built
+from the model the same way as EventModelForm's, and the category name is
+resolved through a map loaded once. The fields are run directly rather than
+through a bound form per row: copying a form's fields for every row cost
+more than the validation itself. Valid rows are inserted with bulk_create
+in batches and invalid ones are reported by row number (counted from 1,
+CSV header excluded).
+
+bulk_create skips post_save, so every batch is added to the search index
+here and the events cache generation is bumped once at the end.
+"""
+import csv
+import json
+import os
+import re
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from events import search
+from events.forms import EventImportForm
+from events.fragments import bump_events_generation
+from events.models import Category, Event
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+FORMATS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "json",
+    ".ndjson": "json",
+}
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class ImportReport:
+    def __init__(self, max_errors=MAX_REPORTED_ERRORS):
+        self.imported = 0
+        self.failed = 0
+        # (row number, {field: [messages]}), at most max_errors of them.
+        self.errors = []
+        self.max_errors = max_errors
+
+    def add_error(self, number, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((number, errors))
+
+    @property
+    def truncated(self):
+        return self.failed > len(self.errors)
+
+
+def detect_format(filename):
+    try:
+        return FORMATS[os.path.splitext(filename)[1].lower()]
+    except KeyError:
+        raise ImportFormatError(f"Unsupported file type {filename!r}; use .csv, .json or .jsonl.")
+
+
+def json_rows(stream, chunk_size=64 * 1024):
+    """Yield the values of a top-level JSON array, or of JSON Lines."""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof, in_array = "", 0, False, None
+    while True:
+        pos = _SEPARATORS.match(buffer, pos).end()
+        if pos < len(buffer):
+            if in_array is None:
+                in_array = buffer[pos] == "["
+                if in_array:
+                    pos += 1
+                continue
+            if in_array and buffer[pos] == "]":
+                return
+            try:
+                row, pos = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # Most likely a row cut in half by the chunk boundary.
+                if eof:
+                    raise ImportFormatError("The file is not valid JSON.")
+            else:
+                yield row
+                continue
+        elif eof:
+            if in_array:
+                raise ImportFormatError("The JSON array is never closed.")
+            return
+        chunk = stream.read(chunk_size)
+        buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+
+
+def read_rows(stream, file_format):
+    """Row dicts from a text stream in `file_format` ("csv" or "json")."""
+    rows = csv.DictReader(stream) if file_format == "csv" else json_rows(stream)
+    try:
+        yield from rows
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ImportFormatError(f"The file could not be read: {e}")
+
+
+class RowValidator:
+    """Clean one row dict with EventImportForm's fields."""
+
+    def __init__(self, categories):
+        self.fields = EventImportForm(categories=categories).fields
+
+    def __call__(self, row):
+        """Return (Event, None) for a valid row, else (None, {field: [messages]})."""
+        cleaned, errors = {}, {}
+        for name, field in self.fields.items():
+            try:
+                cleaned[name] = field.clean(row.get(name))
+            except ValidationError as e:
+                errors[name] = e.messages
+        if errors:
+            return None, errors
+        cleaned["category_id"] = cleaned.pop("category")
+        return Event(**cleaned), None
+
+
+def _insert(batch):
+    created = Event.objects.bulk_create(batch)
+    if search.is_supported():
+        search.index_events([event.pk for event in created])
+
+
+def import_events(rows, batch_size=BATCH_SIZE, dry_run=False, max_errors=MAX_REPORTED_ERRORS):
+    """Validate and insert `rows`; returns an ImportReport.
+
+    The import runs in one transaction, so a file that turns out to be
+    malformed halfway through leaves nothing behind. With dry_run=True rows
+    are only validated.
+    """
+    validate = RowValidator(dict(Category.objects.values_list("name", "id")))
+    report = ImportReport(max_errors)
+    batch = []
+    with transaction.atomic():
+        for number, row in enumerate(rows, start=1):
+            if not isinstance(row, dict):
+                report.add_error(number, {"__all__": ["Expected an object with event fields."]})
+                continue
+            event, errors = validate(row)
+            if errors:
+                report.add_error(number, errors)
+                continue
+            batch.append(event)
+            report.imported += 1
+            if len(batch) >= batch_size:
+                if not dry_run:
+                    _insert(batch)
+                batch = []
+        if batch and not dry_run:
+            _insert(batch)
+    if report.imported and not dry_run:
+        bump_events_generation()
+    return report
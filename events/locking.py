@@ -0,0 +1,28 @@
+"""Write transactions that take SQLite's write lock up front.
+
+SQLite ignores SELECT ... FOR UPDATE, and a deferred transaction that reads
+before it writes can fail with "database is locked" instead of waiting
+when another writer got there first. write_transaction() is atomic() opened
+with BEGIN IMMEDIATE, so check-then-write blocks such as events.rsvp queue
+behind each other for the connection's `timeout`. Everything else keeps the
+default deferred BEGIN, so readers never wait for the lock. On other
+databases, and inside an outer atomic block, it is plain atomic().
+"""
+from django.db import transaction
+
+
+class write_transaction(transaction.Atomic):
+    def __init__(self, using=None):
+        super().__init__(using, savepoint=True, durable=False)
+
+    def __enter__(self):
+        connection = transaction.get_connection(self.using)
+        if connection.vendor != "sqlite" or connection.in_atomic_block:
+            return super().__enter__()
+        # The mode is read from the settings when connecting, so connect first.
+        connection.ensure_connection()
+        mode, connection.transaction_mode = connection.transaction_mode, "IMMEDIATE"
+        try:
+            return super().__enter__()
+        finally:
+            connection.transaction_mode = mode
@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment,
+)
+from django.urls import reverse
+
+from events import search
+from events.benchmarking import (
+    percentile, scratch_database, seed_categories, seed_events, seed_rsvps, seed_users, timed,
+)
+from events.models import Event
+from users.roles import ORGANIZER, PARTICIPANT
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the main pages through the test client at several data sizes "
+        "and report p50/p95 latency and query counts per endpoint. Runs "
+        "against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", nargs="+", type=int, default=[1_000, 10_000, 100_000],
+            help="Event counts; each scale also gets events/10 users and 2 RSVPs per event.",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--cold", action="store_true",
+            help="Clear the cache before every request instead of measuring warm pages.",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with scratch_database(), override_settings(QUERY_BUDGET_RAISE=False):
+                category_ids = seed_categories(50)
+                seeded = 0
+                user_ids = []
+                for size in sorted(options["sizes"]):
+                    first_event = (Event.objects.order_by("-id").values_list("id", flat=True).first() or 0) + 1
+                    seed_events(size - seeded, category_ids, seed=size)
+                    event_ids = list(Event.objects.filter(id__gte=first_event).values_list("id", flat=True))
+                    user_ids += seed_users(max(size // 10, 10) - len(user_ids))
+                    seed_rsvps(2 * (size - seeded), user_ids, event_ids, seed=size)
+                    seeded = size
+                    if search.is_supported():
+                        search.rebuild_index()
+                    cache.clear()
+                    self.report(size, len(user_ids), options["repeat"], options["cold"])
+        finally:
+            teardown_test_environment()
+
+    def report(self, size, users, repeat, cold):
+        organizer = Client()
+        organizer.force_login(User.objects.filter(groups__name=ORGANIZER).first())
+        participant_user = User.objects.filter(groups__name=PARTICIPANT).order_by("id")[users // 2]
+        participant = Client()
+        participant.force_login(participant_user)
+        popular = Event.objects.order_by("-participant_count").values_list("id", flat=True).first()
+        # Fresh events for every RSVP POST, so each one really adds a row.
+        to_join = iter(
+            Event.objects.exclude(participants=participant_user)
+            .order_by("-date").values_list("id", flat=True)[:repeat + 1]
+        )
+
+        endpoints = [
+            ("home", lambda: participant.get(reverse("home"))),
+            ("home ?q=music", lambda: participant.get(reverse("home"), {"q": "music"})),
+            ("organizer_dashboard", lambda: organizer.get(reverse("organizer-dashboard"))),
+            ("user_dashboard", lambda: participant.get(reverse("dashboard"))),
+            ("event_detail", lambda: participant.get(reverse("event-detail", args=[popular]))),
+            ("rsvp POST", lambda: participant.post(
+                reverse("event-detail", args=[next(to_join)]), {"action": "rsvp"},
+            )),
+        ]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{size} events, {users} users"))
+        self.stdout.write(f"  {'endpoint':<22}{'p50':>10}{'p95':>10}{'queries':>9}")
+        for label, request in endpoints:
+            queries = []
+
+            def measured():
+                if cold:
+                    cache.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    response = request()
+                if response.status_code not in (200, 302):
+                    raise CommandError(f"{label} returned HTTP {response.status_code}")
+                queries.append(len(captured))
+
+            samples = timed(measured, repeat)
+            self.stdout.write(
+                f"  {label:<22}{percentile(samples, 50):>8.2f}ms{percentile(samples, 95):>8.2f}ms"
+                f"{max(queries):>9}"
+            )
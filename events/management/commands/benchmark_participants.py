@@ -0,0 +1,92 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from events.benchmarking import scratch_database, seed_categories, seed_users
+from events.forms import EventModelForm
+from events.models import Event
+from events.rsvp import change_participants, sync_participants
+from users.models import OutgoingEmail
+
+
+class Command(BaseCommand):
+    help = (
+        "Time saving the participant list of an event that already has many "
+        "participants, with a few users added and removed: Django's "
+        "participants.set(), sync_participants(), change_participants(), and "
+        "a full EventModelForm save, which posts only the change. Runs against "
+        "a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--participants", type=int, default=50_000)
+        parser.add_argument("--changes", type=int, default=50, help="Users added and as many removed per save.")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        size, changes = options["participants"], options["changes"]
+        # Image variants are made inline so no background writer competes for the database.
+        with scratch_database(), override_settings(EVENT_IMAGE_ASYNC=False):
+            category_id = seed_categories(1)[0]
+            user_ids = seed_users(size + changes)
+            self.event = Event.objects.create(
+                name="Big event", description="Everyone is here.", date="2030-01-01", time="20:00",
+                location="Dhaka", category_id=category_id,
+            )
+            self.original = user_ids[:size]
+            # Drop the first `changes` participants and add as many new users.
+            self.edited = user_ids[changes:]
+            self.added, self.removed = user_ids[size:], user_ids[:changes]
+            Participation = Event.participants.through
+            Participation.objects.bulk_create(
+                [Participation(event_id=self.event.pk, customuser_id=pk) for pk in self.original],
+                batch_size=5000,
+            )
+            Event.objects.filter(pk=self.event.pk).recount_participants()
+
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"Event with {size} participants, {changes} added and {changes} removed per save"
+            ))
+            self.stdout.write(f"  {'path':<24}{'median':>10}{'queries':>9}{'emails':>8}")
+            self.measure("participants.set()", lambda: self.event.participants.set(self.edited), options["repeat"])
+            self.measure("sync_participants()", lambda: sync_participants(self.event, self.edited), options["repeat"])
+            self.measure(
+                "change_participants()",
+                lambda: change_participants(self.event, self.added, self.removed),
+                options["repeat"],
+            )
+            self.measure("EventModelForm.save()", self.save_form, options["repeat"])
+
+    def save_form(self):
+        form = EventModelForm({
+            "name": self.event.name, "description": self.event.description,
+            "category": self.event.category_id, "location": self.event.location,
+            "date": "2030-01-01", "time": "20:00",
+            "participants_add": [str(pk) for pk in self.added],
+            "participants_remove": [str(pk) for pk in self.removed],
+        }, instance=self.event)
+        if not form.is_valid():
+            raise CommandError(form.errors.as_text())
+        form.save()
+
+    def measure(self, label, save, repeat):
+        samples = []
+        for _ in range(repeat):
+            # Back to the original list, outside the timing.
+            sync_participants(self.event, self.original)
+            OutgoingEmail.objects.all().delete()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                save()
+                samples.append((time.perf_counter() - started) * 1000)
+        self.event.refresh_from_db()
+        if self.event.participant_count != len(self.edited):
+            raise CommandError(f"{label} left participant_count at {self.event.participant_count}.")
+        samples.sort()
+        self.stdout.write(
+            f"  {label:<24}{samples[len(samples) // 2]:>8.1f}ms{len(queries):>9}"
+            f"{OutgoingEmail.objects.count():>8}"
+        )
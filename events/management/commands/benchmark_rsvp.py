@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from events import rsvp
+from events.benchmarking import percentile, scratch_database, seed_categories, seed_users
+from events.models import Event, WaitlistEntry
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress-test RSVPs: many threads RSVP to one limited-capacity event at "
+        "the same moment, then every seated user cancels at once while the "
+        "waitlist is promoted. Checks that no seat was handed out twice and no "
+        "promotion was lost. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=300)
+        parser.add_argument("--capacity", type=int, default=100)
+        parser.add_argument("--threads", type=int, default=32)
+        parser.add_argument(
+            "--clicks", type=int, default=2,
+            help="How many times each user submits the RSVP, to simulate double-clicks.",
+        )
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        with scratch_database():
+            category_id = seed_categories(1)[0]
+            users = list(User.objects.filter(pk__in=seed_users(options["users"])))
+            event = Event.objects.create(
+                name="Sold out show", date="2030-01-01", time="20:00", location="Dhaka",
+                category_id=category_id, capacity=options["capacity"],
+            )
+            expected = min(options["capacity"], options["users"])
+
+            attempts = [user for user in users for _ in range(options["clicks"])]
+            self.report("RSVP", self.storm(rsvp.rsvp, event.pk, attempts, threads), threads)
+            self.verify(event, expected, len(users) - expected)
+
+            seated = list(event.participants.all())
+            promotable = min(len(seated), len(users) - expected)
+            self.report("cancel", self.storm(rsvp.cancel_rsvp, event.pk, seated, threads), threads)
+            self.verify(event, promotable, len(users) - expected - promotable)
+
+        self.stdout.write(self.style.SUCCESS("No seat was handed out twice and no promotion was lost."))
+
+    def storm(self, action, event_id, users, threads):
+        """Run action(event_id, user) for every user, spread over `threads` threads."""
+        outcomes = Counter()
+        latencies = []
+        lock = threading.Lock()
+        start = threading.Barrier(threads)
+
+        def worker(share):
+            start.wait()
+            try:
+                for user in share:
+                    started = time.perf_counter()
+                    try:
+                        outcome = action(event_id, user)
+                    except Exception as e:
+                        outcome = f"error: {type(e).__name__}: {e}"
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        outcomes[outcome] += 1
+                        latencies.append(elapsed)
+            finally:
+                close_old_connections()
+
+        workers = [threading.Thread(target=worker, args=(users[i::threads],)) for i in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return outcomes, latencies, time.perf_counter() - started
+
+    def report(self, label, result, threads):
+        outcomes, latencies, wall = result
+        total = sum(outcomes.values())
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{total} concurrent {label}s on {threads} threads in {wall:.2f}s ({total / wall:.0f}/s)"
+        ))
+        for outcome, count in sorted(outcomes.items()):
+            self.stdout.write(f"  {outcome:<20}{count:>8}")
+        self.stdout.write(
+            f"  latency p50 {percentile(latencies, 50):.1f}ms, p95 {percentile(latencies, 95):.1f}ms"
+        )
+
+    def verify(self, event, seats, waiting):
+        event.refresh_from_db()
+        taken = event.participants.count()
+        queued = WaitlistEntry.objects.filter(event=event).count()
+        self.stdout.write(
+            f"  participants {taken}, participant_count {event.participant_count}, waitlist {queued}"
+        )
+        if (taken, event.participant_count, queued) != (seats, seats, waiting):
+            raise CommandError(f"Expected {seats} seats taken and {waiting} users waiting.")
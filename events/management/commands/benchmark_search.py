@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from events import search
+from events.benchmarking import percentile, scratch_database, seed_categories, seed_events, timed
+from events.models import Event
+from events.pagination import DEFAULT_PAGE_SIZE
+
+QUERIES = ["music", "conf", "dhaka", "tech summit", "yoga work"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare full-text search against the icontains fallback at several "
+        "table sizes. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError("Full-text search is not supported on this database backend.")
+
+        with scratch_database():
+            category_ids = seed_categories(50)
+            seeded = 0
+            for size in sorted(options["sizes"]):
+                seed_events(size - seeded, category_ids, seed=size)
+                seeded = size
+                search.rebuild_index()
+                self.report(size, options["repeat"])
+
+    def report(self, size, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{size} events"))
+        self.stdout.write(f"  {'query':<14}{'fts p50':>10}{'fts p95':>10}{'like p50':>10}{'like p95':>10}")
+        limit = DEFAULT_PAGE_SIZE
+        for query in QUERIES:
+            fts = timed(
+                lambda: search.in_rank_order(Event.objects.all(), search.search_event_ids(query)),
+                repeat,
+            )
+            # Same page size for both so only the lookup strategy differs.
+            like = timed(
+                lambda: list(Event.objects.filter(
+                    Q(name__icontains=query) | Q(location__icontains=query)
+                )[:limit]),
+                repeat,
+            )
+            self.stdout.write(
+                f"  {query:<14}"
+                f"{percentile(fts, 50):>8.2f}ms{percentile(fts, 95):>8.2f}ms"
+                f"{percentile(like, 50):>8.2f}ms{percentile(like, 95):>8.2f}ms"
+            )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from events.benchmarking import startup_imports
+
+
+class Command(BaseCommand):
+    help = (
+        "Report how long a fresh process takes to import the WSGI application "
+        "and URLconf (python -X importtime), and the slowest imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settings-module", nargs="+",
+            default=["event_management.settings.prod", "event_management.settings.dev"],
+        )
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        for module in options["settings_module"]:
+            # Keep the fastest run; the slower ones mostly measure a cold disk cache.
+            imports, total = min(
+                (startup_imports(module) for _ in range(options["repeat"])),
+                key=lambda run: run[1],
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{module}: {total / 1000:.1f}ms, {len(imports)} modules"
+            ))
+            slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)
+            for name, cumulative in slowest[:options["top"]]:
+                self.stdout.write(f"  {cumulative / 1000:>8.1f}ms  {name}")
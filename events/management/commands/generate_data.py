@@ -0,0 +1,73 @@
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+
+from events import search
+from events.benchmarking import seed_categories, seed_events, seed_prefix, seed_rsvps, seed_users
+from events.fragments import bump_events_generation
+from events.models import Category, Event
+from users.roles import invalidate_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Add synthetic categories, events, users (in the Organizer and "
+        "Participant groups) and RSVPs to the configured database, to "
+        "reproduce production scale locally."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--events", type=int, default=100_000)
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--rsvps", type=int, default=200_000)
+        parser.add_argument("--days", type=int, default=730, help="Spread events over this many days around today.")
+        parser.add_argument("--organizer-ratio", type=float, default=0.02)
+        parser.add_argument("--password", default="password", help="Password given to every generated user.")
+        parser.add_argument(
+            "--user-prefix", help="Username prefix, followed by 1, 2, ... (default: a new one for every run).",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        with self.step(f"{options['categories']} categories"):
+            category_ids = seed_categories(Category.objects.count() + options["categories"])
+
+        with self.step(f"{options['events']} events"):
+            first_event = (Event.objects.order_by("-id").values_list("id", flat=True).first() or 0) + 1
+            seed_events(
+                options["events"], category_ids,
+                batch_size=batch_size, days=options["days"], seed=options["seed"],
+            )
+            event_ids = list(Event.objects.filter(id__gte=first_event).values_list("id", flat=True))
+
+        prefix = options["user_prefix"] or seed_prefix()
+        with self.step(f"{options['users']} users named {prefix}1, {prefix}2, ..."):
+            user_ids = seed_users(
+                options["users"], organizer_ratio=options["organizer_ratio"],
+                batch_size=batch_size, password=options["password"], prefix=prefix,
+            )
+
+        if user_ids and event_ids:
+            with self.step(f"{options['rsvps']} RSVPs"):
+                seed_rsvps(options["rsvps"], user_ids, event_ids, batch_size=batch_size, seed=options["seed"])
+
+        if search.is_supported():
+            with self.step("search index"):
+                search.rebuild_index()
+
+        # bulk_create bypassed the receivers that keep these caches fresh.
+        bump_events_generation()
+        invalidate_all()
+
+    @contextmanager
+    def step(self, label):
+        self.stdout.write(f"Generating {label}...", ending="")
+        self.stdout.flush()
+        started = time.perf_counter()
+        yield
+        self.stdout.write(self.style.SUCCESS(f" {time.perf_counter() - started:.1f}s"))
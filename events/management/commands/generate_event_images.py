@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from events import images
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Generate missing or stale resized variants of event images."
+
+    def handle(self, *args, **options):
+        processed = 0
+        events = Event.objects.exclude(asset="").exclude(asset__isnull=True).only("asset", "asset_variants")
+        for event in events.iterator(chunk_size=500):
+            if images.needs_variants(event):
+                images.process_event_image(event.pk)
+                processed += 1
+        self.stdout.write(self.style.SUCCESS(f"Generated variants for {processed} events."))
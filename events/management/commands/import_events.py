@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events.importing import (
+    BATCH_SIZE, MAX_REPORTED_ERRORS, ImportFormatError, detect_format, import_events, read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import events from a CSV or JSON file (an array of objects or JSON "
+        "Lines) with the columns name, description, category (by name), "
+        "location, date, time and capacity. Invalid rows are reported and "
+        "skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "json"], help="Default: from the file extension.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument("--max-errors", type=int, default=MAX_REPORTED_ERRORS, help="Row errors to print.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row without saving.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            file_format = options["format"] or detect_format(options["path"])
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                report = import_events(
+                    read_rows(stream, file_format),
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                    max_errors=options["max_errors"],
+                )
+        except (OSError, ImportFormatError) as e:
+            raise CommandError(e)
+
+        for number, errors in report.errors:
+            for field, messages in errors.items():
+                self.stderr.write(f"row {number}: {field}: {' '.join(messages)}")
+        if report.truncated:
+            self.stderr.write(f"... and {report.failed - len(report.errors)} more invalid rows")
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report.imported} events in {time.perf_counter() - started:.1f}s, "
+            f"{report.failed} rows rejected."
+        ))
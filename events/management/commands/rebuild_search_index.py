@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events import search
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for all events."
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError("Full-text search is not supported on this database backend.")
+        search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {Event.objects.count()} events."))
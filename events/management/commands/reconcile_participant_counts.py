@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Recompute Event.participant_count from the participants table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=10_000,
+            help="Number of event ids checked per UPDATE statement.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = Event.objects.aggregate(last=Max("id"))["last"] or 0
+
+        fixed = 0
+        for start in range(0, last_id + 1, batch_size):
+            fixed += (
+                Event.objects
+                .filter(id__gte=start, id__lt=start + batch_size)
+                .with_stale_participant_count()
+                .recount_participants()
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled participant counts, {fixed} events corrected."))
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+
+SEARCH_TABLE = "events_event_fts"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "name, description, location, category, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, name, description, location, category) "
+            "SELECT e.id, e.name, e.description, e.location, c.name "
+            "FROM events_event e JOIN events_category c ON c.id = e.category_id"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            "event_id bigint PRIMARY KEY REFERENCES events_event(id) "
+            "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx "
+            f"ON {SEARCH_TABLE} USING GIN (document)"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {SEARCH_TABLE} (event_id, document) "
+            "SELECT e.id, "
+            "setweight(to_tsvector('simple', e.name), 'A') || "
+            "setweight(to_tsvector('simple', e.location), 'B') || "
+            "setweight(to_tsvector('simple', c.name), 'B') || "
+            "setweight(to_tsvector('simple', e.description), 'C') "
+            "FROM events_event e JOIN events_category c ON c.id = e.category_id"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_asset'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
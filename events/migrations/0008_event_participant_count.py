@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:51
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_participant_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    through = Event.participants.through
+    counts = (
+        through.objects
+        .filter(event=OuterRef('pk'))
+        .order_by()
+        .values('event')
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    Event.objects.update(participant_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_participant_count, migrations.RunPython.noop),
+    ]
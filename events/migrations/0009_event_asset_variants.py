@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_event_participant_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='asset_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
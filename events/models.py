@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.conf import settings
 
@@ -12,6 +14,28 @@ class Category(models.Model):
 
 
 
+def participant_total():
+    """Expression counting an event's rows in the participants table."""
+    counts = (
+        Event.participants.through.objects
+        .filter(event=OuterRef("pk"))
+        .order_by()
+        .values("event")
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+class EventQuerySet(models.QuerySet):
+    def with_stale_participant_count(self):
+        return self.exclude(participant_count=participant_total())
+
+    def recount_participants(self):
+        """Reset participant_count from the through table in one UPDATE."""
+        return self.update(participant_count=participant_total(), updated_at=timezone.now())
+
+
 class Event(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -25,14 +49,65 @@ class Event(models.Model):
         related_name="rsvp_events",
         blank=True
     )
+    # Denormalized len(participants), kept current by the m2m_changed
+    # receiver in users.signals; `manage.py reconcile_participant_counts`
+    # repairs drift.
+    participant_count = models.PositiveIntegerField(default=0, editable=False)
+    # Seats available through RSVP (events.rsvp); empty means unlimited.
+    capacity = models.PositiveIntegerField(null=True, blank=True)
     asset = models.ImageField(
     upload_to='events_asset/',
     default='events_asset/default_event.jpg',
     blank=True,
     null=True
     )
+    # Resized copies of `asset` written by events.images:
+    # {"source": asset name, "webp": {width: name}, "jpeg": {width: name}}
+    asset_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Upcoming/past/today predicates and the (date, time, id) keyset
+            # used by every event listing, in either direction.
+            models.Index(fields=["date", "time", "id"], name="event_date_time_idx"),
+            # Category filter combined with a date range and the same order.
+            models.Index(fields=["category", "date", "time", "id"], name="event_category_date_idx"),
+        ]
+
     def __str__(self):
         return self.name
+
+    @property
+    def seats_left(self):
+        if self.capacity is None:
+            return None
+        return max(self.capacity - self.participant_count, 0)
+
+    @property
+    def is_full(self):
+        return self.capacity is not None and self.participant_count >= self.capacity
+
+
+class WaitlistEntry(models.Model):
+    """A user waiting for a seat at a full event (see events.rsvp)."""
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="waitlist")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="waitlist_entries")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "user"], name="waitlist_event_user_unique"),
+        ]
+        indexes = [
+            # Head of an event's queue (and a user's position in it) is an
+            # index seek, however long the queue gets.
+            models.Index(fields=["event", "created_at", "id"], name="waitlist_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} waiting for {self.event}"
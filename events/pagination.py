@@ -0,0 +1,163 @@
+"""Keyset (seek) pagination.
+
+A page is addressed by an opaque cursor holding the ordering values of the
+row it starts after (or ends before), and fetched with a WHERE clause on
+those values instead of an OFFSET. Every page therefore costs one
+LIMIT page_size + 1 query no matter how deep it is, and rows inserted
+while a client is paging never shift the pages it has not seen yet.
+
+The ordering must end with a unique column (normally "id") so that the
+cursor identifies exactly one position.
+"""
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import JsonResponse
+
+DEFAULT_PAGE_SIZE = 24
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor=None, previous_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def _split(ordering):
+    return [(field.lstrip("-"), field.startswith("-")) for field in ordering]
+
+
+def _row_values(row, fields):
+    if isinstance(row, dict):
+        return [row[name] for name, _ in fields]
+    return [getattr(row, name) for name, _ in fields]
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def load_cursor(token, length):
+    """The raw list of `length` values in `token`."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor(token)
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursor(token)
+    return values
+
+
+def decode_cursor(token, model, fields):
+    values = load_cursor(token, len(fields))
+    try:
+        return [
+            model._meta.get_field(name).to_python(value)
+            for (name, _), value in zip(fields, values)
+        ]
+    except (ValidationError, TypeError):
+        raise InvalidCursor(token)
+
+
+def _seek(fields, values, forward):
+    """Q object selecting the rows strictly after (or before) `values`."""
+    clauses = []
+    for index, (name, descending) in enumerate(fields):
+        lookup = f"{name}__gt" if descending != forward else f"{name}__lt"
+        equal = {fields[i][0]: values[i] for i in range(index)}
+        clauses.append(Q(**equal, **{lookup: values[index]}))
+    # The redundant inclusive bound on the leading column gives the planner
+    # an index range to start from; the OR chain alone often defeats it.
+    name, descending = fields[0]
+    bound = Q(**{f"{name}__gte" if descending != forward else f"{name}__lte": values[0]})
+    return bound & reduce(or_, clauses)
+
+
+def paginate(queryset, ordering, after=None, before=None, page_size=DEFAULT_PAGE_SIZE):
+    """Return the KeysetPage of `queryset` sorted by `ordering`.
+
+    `after` and `before` are cursors taken from a previous page; invalid
+    cursors raise InvalidCursor.
+    """
+    fields = _split(ordering)
+    model = queryset.model
+    forward = before is None
+
+    if after is not None and forward:
+        queryset = queryset.filter(_seek(fields, decode_cursor(after, model, fields), True))
+    elif not forward:
+        queryset = queryset.filter(_seek(fields, decode_cursor(before, model, fields), False))
+        ordering = [field[1:] if field.startswith("-") else f"-{field}" for field in ordering]
+
+    rows = list(queryset.order_by(*ordering)[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+
+    next_cursor = previous_cursor = None
+    if rows:
+        first = encode_cursor(_row_values(rows[0], fields))
+        last = encode_cursor(_row_values(rows[-1], fields))
+        if forward:
+            next_cursor = last if has_more else None
+            previous_cursor = first if after is not None else None
+        else:
+            next_cursor = last
+            previous_cursor = first if has_more else None
+    return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+def paginate_request(request, queryset, ordering, page_size=DEFAULT_PAGE_SIZE):
+    """paginate() driven by the `after` / `before` query string parameters.
+
+    A malformed cursor restarts from the first page instead of failing.
+    """
+    after = request.GET.get("after") or None
+    before = request.GET.get("before") or None
+    try:
+        return paginate(queryset, ordering, after=after, before=before, page_size=page_size)
+    except InvalidCursor:
+        return paginate(queryset, ordering, page_size=page_size)
+
+
+def wants_json(request):
+    return request.GET.get("format") == "json"
+
+
+def json_page(page, serialize=dict):
+    return JsonResponse({
+        "results": [serialize(row) for row in page.items],
+        "next": page.next_cursor,
+        "previous": page.previous_cursor,
+    })
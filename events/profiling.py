@@ -0,0 +1,176 @@
+"""Query accounting for views.
+
+query_budget() counts the SQL statements a view issues (including those run
+while its template renders) and complains when the count goes over the
+budget: it raises QueryBudgetExceeded when settings.QUERY_BUDGET_RAISE is
+on (the default under DEBUG) and logs a warning otherwise, so a regression
+shows up in development without taking production pages down.
+
+RequestProfilingMiddleware profiles a sampled fraction of requests
+(settings.PROFILING_SAMPLE_RATE): query count, SQL time, template render
+time and wall time per view. It logs one "profile" line per sampled request,
+adds a Server-Timing header (unless PROFILING_SERVER_TIMING is off), and
+warns when a single SQL statement shape repeats more than
+PROFILING_N_PLUS_ONE_THRESHOLD times in one request.
+Template time is collected by ProfilingDjangoTemplates, the template
+backend configured in settings.TEMPLATES. Unsampled requests pay for one
+random() call.
+"""
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection, connections
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def query_budget(limit):
+    """Decorate a view so it may run at most `limit` queries."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                response = view_func(request, *args, **kwargs)
+            if counter.count > limit:
+                message = (
+                    f"{view_func.__module__}.{view_func.__name__} ran {counter.count} "
+                    f"queries, budget is {limit}"
+                )
+                if getattr(settings, "QUERY_BUDGET_RAISE", settings.DEBUG):
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+            return response
+        return wrapper
+    return decorator
+
+
+_profile = ContextVar("request_profile", default=None)
+
+# Runs of placeholders, so "IN (%s, %s)" and "IN (%s, %s, %s)" share a shape.
+_PLACEHOLDERS = re.compile(r"%s(?:\s*,\s*%s)+")
+
+
+def sql_shape(sql):
+    return _PLACEHOLDERS.sub("%s, ...", sql)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.view = None
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.rendering = False
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def repeated_queries(self, threshold):
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+class ProfilingTemplate(Template):
+    def render(self, context=None, request=None):
+        profile = _profile.get()
+        # Only the outermost render is timed; templates rendered from inside
+        # another one are already part of its time.
+        if profile is None or profile.rendering:
+            return super().render(context, request)
+        profile.rendering = True
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            profile.template_time += time.perf_counter() - started
+            profile.rendering = False
+
+
+class ProfilingDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates whose templates report their render time to the profiler."""
+
+    def from_string(self, template_code):
+        return ProfilingTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return ProfilingTemplate(super().get_template(template_name).template, self)
+
+
+class RequestProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+        if rate <= 0 or random.random() >= rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        total = time.perf_counter() - started
+
+        view = profile.view or request.path
+        if getattr(settings, "PROFILING_SERVER_TIMING", True):
+            response["Server-Timing"] = ", ".join([
+                f'sql;dur={profile.sql_time * 1000:.1f};desc="{profile.queries} queries"',
+                f"tpl;dur={profile.template_time * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ])
+        logger.info(
+            "profile view=%s status=%s queries=%d sql_ms=%.1f template_ms=%.1f total_ms=%.1f",
+            view, response.status_code, profile.queries,
+            profile.sql_time * 1000, profile.template_time * 1000, total * 1000,
+            extra={
+                "view": view,
+                "status": response.status_code,
+                "queries": profile.queries,
+                "sql_ms": round(profile.sql_time * 1000, 1),
+                "template_ms": round(profile.template_time * 1000, 1),
+                "total_ms": round(total * 1000, 1),
+            },
+        )
+        threshold = getattr(settings, "PROFILING_N_PLUS_ONE_THRESHOLD", 10)
+        for shape, count in profile.repeated_queries(threshold):
+            logger.warning("Possible N+1 in %s: %d x %s", view, count, shape)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = _profile.get()
+        if profile is not None:
+            profile.view = f"{view_func.__module__}.{view_func.__qualname__}"
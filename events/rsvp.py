@@ -0,0 +1,232 @@
+"""RSVP with capacity limits and a waitlist.
+
+rsvp() and cancel_rsvp() lock the event row (SELECT ... FOR UPDATE) for the
+whole check-and-insert, so concurrent requests for one event are applied one
+after another: a seat is never handed out twice and a double-click cannot
+add the same user twice. SQLite ignores FOR UPDATE; there the transactions
+are opened with BEGIN IMMEDIATE (events.locking.write_transaction) and hold
+the write lock from the start. The unique (event, user) constraints on the
+through table and on WaitlistEntry back both up.
+
+When a full event gets an RSVP the user joins its waitlist instead. Every
+freed seat is handed to the oldest waitlist entry in the same transaction
+that freed it, read with one seek on the (event, created_at, id) index.
+A user who gets a seat some other way (the organizer's participant list,
+the API) leaves the waitlist at once (see events.signals). Seats freed
+without a promotion, such as a deleted account's, are promoted by the
+users app's delete receiver, and rsvp() fills them from the queue before
+seating a newcomer, so nobody overtakes a waiting user.
+
+Participants still go through participants.add()/remove(), so the
+m2m_changed receivers keep participant_count, confirmation emails (also
+sent on promotion) and cached fragments in step as before.
+
+sync_participants() is the organizer's side: it replaces the whole list by
+applying only the difference to the through table, and sends the same
+m2m_changed signals once per changed set. change_participants() applies an
+explicit add/remove diff, which is what the event form posts, so an edit
+costs the size of the change rather than of the list.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.db.models.signals import m2m_changed
+
+from events.locking import write_transaction
+from events.models import Event, WaitlistEntry
+
+JOINED = "joined"
+ALREADY_JOINED = "already_joined"
+WAITLISTED = "waitlisted"
+ALREADY_WAITLISTED = "already_waitlisted"
+SOLD_OUT = "sold_out"
+
+CANCELLED = "cancelled"
+LEFT_WAITLIST = "left_waitlist"
+NOT_JOINED = "not_joined"
+
+
+def _queue(event_id):
+    return WaitlistEntry.objects.filter(event_id=event_id).order_by("created_at", "id")
+
+
+def rsvp(event_id, user, waitlist=True):
+    """Give `user` a seat at the event if one is left, else queue them.
+
+    With waitlist=False a full event answers SOLD_OUT instead.
+    """
+    with write_transaction():
+        event = Event.objects.select_for_update().get(pk=event_id)
+        if event.participants.filter(pk=user.pk).exists():
+            return ALREADY_JOINED
+        # Seats freed without a promotion (e.g. a deleted account) go to
+        # the queue first, so a newcomer never overtakes waiting users.
+        if not event.is_full and _queue(event.pk).exists():
+            _fill_seats(event)
+            event.refresh_from_db(fields=["participant_count"])
+        if not event.is_full:
+            event.participants.add(user)
+            return JOINED
+        if not waitlist:
+            return SOLD_OUT
+        _, created = WaitlistEntry.objects.get_or_create(event=event, user=user)
+        return WAITLISTED if created else ALREADY_WAITLISTED
+
+
+def cancel_rsvp(event_id, user):
+    """Give up `user`'s seat (or waitlist spot); returns the outcome.
+
+    A freed seat goes to the next user on the waitlist before the
+    transaction commits.
+    """
+    with write_transaction():
+        event = Event.objects.select_for_update().get(pk=event_id)
+        if event.participants.filter(pk=user.pk).exists():
+            event.participants.remove(user)
+            _fill_seats(event)
+            return CANCELLED
+        if WaitlistEntry.objects.filter(event=event, user=user).delete()[0]:
+            return LEFT_WAITLIST
+        return NOT_JOINED
+
+
+def promote_waitlist(event_id):
+    """Fill any free seats from the waitlist, e.g. after capacity was raised."""
+    with write_transaction():
+        return _fill_seats(Event.objects.select_for_update().get(pk=event_id))
+
+
+def discard_seated_entries(event_id, user_ids):
+    """Delete the event's waitlist entries of `user_ids`, who were just given a seat."""
+    return sum(
+        WaitlistEntry.objects.filter(event_id=event_id, user_id__in=chunk).delete()[0]
+        for chunk in _chunks(user_ids)
+    )
+
+
+def _fill_seats(event):
+    # The caller holds the event lock; re-read the count the receivers updated.
+    event.refresh_from_db(fields=["participant_count", "capacity"])
+    free = event.seats_left
+    promoted = []
+    while free != 0:
+        entries = list(_queue(event.pk)[:free] if free is not None else _queue(event.pk))
+        if not entries:
+            break
+        WaitlistEntry.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+        # An entry whose user already has a seat (left by older code) is
+        # dropped without using up a seat; the loop takes the next one.
+        seated = set(
+            Event.participants.through.objects.filter(
+                event_id=event.pk, customuser_id__in=[entry.user_id for entry in entries],
+            ).values_list("customuser_id", flat=True)
+        )
+        entries = [entry for entry in entries if entry.user_id not in seated]
+        event.participants.add(*[entry.user_id for entry in entries])
+        promoted += entries
+        if free is None:
+            break
+        free -= len(entries)
+    return promoted
+
+
+def _chunks(ids):
+    # One statement normally; split only past the backend's parameter limit.
+    ids = list(ids)
+    limit = connection.features.max_query_params
+    if not limit:
+        yield ids
+        return
+    # One parameter is left for the event id.
+    size = max(limit - 1, 1)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _changed(event, action, pk_set):
+    m2m_changed.send(
+        sender=Event.participants.through, instance=event, action=action, reverse=False,
+        model=get_user_model(), pk_set=pk_set, using=connection.alias,
+    )
+
+
+def sync_participants(event, user_ids):
+    """Make `user_ids` the event's participants; returns the (added, removed) id sets.
+
+    The current rows are read in one query. Removed rows go in one DELETE
+    and added rows in one bulk INSERT, instead of the per-object work of
+    participants.set(). m2m_changed is sent once for each set, like
+    remove() and add() do, so the receivers (participant_count, one
+    batch of confirmation emails, fragment cache) run once per save.
+    """
+    Participation = Event.participants.through
+    wanted = set(user_ids)
+    with write_transaction():
+        # Serialised with rsvp() and cancel_rsvp() on the same event.
+        Event.objects.select_for_update().filter(pk=event.pk).exists()
+        current = set(
+            Participation.objects.filter(event_id=event.pk).values_list("customuser_id", flat=True)
+        )
+        added, removed = wanted - current, current - wanted
+        _apply(event, added, removed)
+    return added, removed
+
+
+def change_participants(event, add=(), remove=()):
+    """Seat the users in `add` and unseat those in `remove`; returns the (added, removed) id sets.
+
+    Only the listed ids are read back, so the cost follows the size of the
+    change. A user in both sets stays seated. Signals go out as in
+    sync_participants().
+    """
+    Participation = Event.participants.through
+    add = set(add)
+    remove = set(remove) - add
+    with write_transaction():
+        Event.objects.select_for_update().filter(pk=event.pk).exists()
+        present = set()
+        for chunk in _chunks(add | remove):
+            present.update(
+                Participation.objects.filter(event_id=event.pk, customuser_id__in=chunk)
+                .values_list("customuser_id", flat=True)
+            )
+        added, removed = add - present, remove & present
+        _apply(event, added, removed)
+    return added, removed
+
+
+def _apply(event, added, removed):
+    Participation = Event.participants.through
+    if removed:
+        _changed(event, "pre_remove", removed)
+        for chunk in _chunks(removed):
+            Participation.objects.filter(event_id=event.pk, customuser_id__in=chunk).delete()
+        _changed(event, "post_remove", removed)
+    if added:
+        _changed(event, "pre_add", added)
+        Participation.objects.bulk_create(
+            [Participation(event_id=event.pk, customuser_id=pk) for pk in added],
+        )
+        _changed(event, "post_add", added)
+
+
+def rsvp_status(event_id, user):
+    """JOINED, WAITLISTED or NOT_JOINED for `user` at the event."""
+    if not Event.objects.filter(pk=event_id).exists():
+        raise Event.DoesNotExist
+    if Event.participants.through.objects.filter(event_id=event_id, customuser_id=user.pk).exists():
+        return JOINED
+    if WaitlistEntry.objects.filter(event_id=event_id, user=user).exists():
+        return WAITLISTED
+    return NOT_JOINED
+
+
+def waitlist_position(event_id, user):
+    """1-based place of `user` in the event's queue, or None if not queued."""
+    entry = WaitlistEntry.objects.filter(event_id=event_id, user=user).first()
+    if entry is None:
+        return None
+    ahead = _queue(event_id).filter(created_at__lte=entry.created_at).filter(
+        Q(created_at__lt=entry.created_at) | Q(created_at=entry.created_at, id__lt=entry.id)
+    )
+    return ahead.count() + 1
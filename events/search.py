@@ -0,0 +1,211 @@
+"""Full-text search over events.
+
+SQLite databases use an FTS5 virtual table and PostgreSQL a tsvector side
+table with a GIN index. Both hold one row per event (name, description,
+location and category name) keyed by the event id, and are kept in sync by
+the receivers in events.signals. When the index is missing or the backend
+has no full-text support, ranked_page() returns None and callers fall
+back to the plain icontains lookup.
+
+Results are paged like every other listing (events.pagination), except
+that the cursor holds a row's (score, id) instead of column values: the
+score is bm25() on SQLite (lower is better) and the negated ts_rank() on
+PostgreSQL, so both sort ascending.
+"""
+import logging
+import re
+
+from django.db import DatabaseError, connection, transaction
+
+from events.models import Category, Event
+from events.pagination import DEFAULT_PAGE_SIZE, InvalidCursor, KeysetPage, encode_cursor, load_cursor
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "events_event_fts"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# bm25 column weights for SQLite, in table column order:
+# name, description, location, category
+SQLITE_WEIGHTS = (10.0, 1.0, 4.0, 2.0)
+
+
+def is_supported():
+    return connection.vendor in ("sqlite", "postgresql")
+
+
+def _tables():
+    return Event._meta.db_table, Category._meta.db_table
+
+
+def _reindex(where, params):
+    """(Re)build the index rows of every event matching the SQL `where`."""
+    event_table, category_table = _tables()
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN "
+                f"(SELECT e.id FROM {event_table} e WHERE {where})",
+                params,
+            )
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} "
+                "(rowid, name, description, location, category) "
+                "SELECT e.id, e.name, e.description, e.location, c.name "
+                f"FROM {event_table} e "
+                f"JOIN {category_table} c ON c.id = e.category_id "
+                f"WHERE {where}",
+                params,
+            )
+        else:
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} (event_id, document) "
+                "SELECT e.id, "
+                "setweight(to_tsvector('simple', e.name), 'A') || "
+                "setweight(to_tsvector('simple', e.location), 'B') || "
+                "setweight(to_tsvector('simple', c.name), 'B') || "
+                "setweight(to_tsvector('simple', e.description), 'C') "
+                f"FROM {event_table} e "
+                f"JOIN {category_table} c ON c.id = e.category_id "
+                f"WHERE {where} "
+                "ON CONFLICT (event_id) DO UPDATE SET document = EXCLUDED.document",
+                params,
+            )
+
+
+def _safely(operation, *args):
+    # Index maintenance must never break the write that triggered it; the
+    # savepoint keeps a PostgreSQL transaction usable after a failure.
+    if not is_supported():
+        return
+    try:
+        with transaction.atomic():
+            operation(*args)
+    except DatabaseError:
+        logger.exception("Search index update failed")
+
+
+def index_events(event_ids):
+    event_ids = [int(pk) for pk in event_ids]
+    if event_ids:
+        placeholders = ", ".join(["%s"] * len(event_ids))
+        _safely(_reindex, f"e.id IN ({placeholders})", event_ids)
+
+
+def index_category(category_id):
+    _safely(_reindex, "e.category_id = %s", [category_id])
+
+
+def _delete(event_ids):
+    placeholders = ", ".join(["%s"] * len(event_ids))
+    column = "rowid" if connection.vendor == "sqlite" else "event_id"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE {column} IN ({placeholders})",
+            event_ids,
+        )
+
+
+def remove_events(event_ids):
+    event_ids = [int(pk) for pk in event_ids]
+    if event_ids:
+        _safely(_delete, event_ids)
+
+
+def rebuild_index():
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        _reindex("1 = 1", [])
+
+
+def _match_expression(tokens):
+    if connection.vendor == "sqlite":
+        # Every token must match, each one as a prefix, so "conf berl"
+        # finds "Conference in Berlin".
+        return " ".join(f'"{token}"*' for token in tokens)
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def _scored_sql(expression):
+    if connection.vendor == "sqlite":
+        weights = ", ".join(str(w) for w in SQLITE_WEIGHTS)
+        return (
+            f"SELECT rowid AS id, bm25({SEARCH_TABLE}, {weights}) AS score "
+            f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s"
+        ), [expression]
+    return (
+        "SELECT event_id AS id, -ts_rank(document, to_tsquery('simple', %s)) AS score "
+        f"FROM {SEARCH_TABLE} WHERE document @@ to_tsquery('simple', %s)"
+    ), [expression, expression]
+
+
+def _cursor_values(token):
+    score, pk = load_cursor(token, 2)
+    if not isinstance(score, (int, float)) or not isinstance(pk, int):
+        raise InvalidCursor(token)
+    return [score, pk]
+
+
+def ranked_page(query, after=None, before=None, page_size=DEFAULT_PAGE_SIZE):
+    """KeysetPage of the ids of events matching `query`, best match first.
+
+    Returns None when full-text search is unavailable so the caller can use
+    its own fallback. Invalid cursors raise InvalidCursor.
+    """
+    tokens = TOKEN_RE.findall(query.lower())
+    if not tokens or not is_supported():
+        return None
+
+    forward = before is None
+    scored, params = _scored_sql(_match_expression(tokens))
+    sql = f"SELECT score, id FROM ({scored}) ranked"
+    if after is not None and forward:
+        sql += " WHERE (score, id) > (%s, %s)"
+        params += _cursor_values(after)
+    elif not forward:
+        sql += " WHERE (score, id) < (%s, %s)"
+        params += _cursor_values(before)
+    direction = "" if forward else " DESC"
+    sql += f" ORDER BY score{direction}, id{direction} LIMIT %s"
+    params.append(page_size + 1)
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = [list(row) for row in cursor.fetchall()]
+    except DatabaseError:
+        logger.warning("Search index unavailable, falling back to LIKE", exc_info=True)
+        return None
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+    next_cursor = previous_cursor = None
+    if rows:
+        first, last = encode_cursor(rows[0]), encode_cursor(rows[-1])
+        if forward:
+            next_cursor = last if has_more else None
+            previous_cursor = first if after is not None else None
+        else:
+            next_cursor = last
+            previous_cursor = first if has_more else None
+    return KeysetPage([pk for _, pk in rows], next_cursor, previous_cursor)
+
+
+def search_event_ids(query, limit=DEFAULT_PAGE_SIZE):
+    """Ids of the best `limit` events matching `query`, or None (see ranked_page)."""
+    page = ranked_page(query, page_size=limit)
+    return None if page is None else page.items
+
+
+def in_rank_order(queryset, ranked_ids):
+    """Fetch the events in `ranked_ids`, preserving the ranking."""
+    position = {pk: index for index, pk in enumerate(ranked_ids)}
+
+    def rank(row):
+        return position[row["id"] if isinstance(row, dict) else row.id]
+
+    return sorted(queryset.filter(id__in=ranked_ids), key=rank)
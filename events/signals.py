@@ -0,0 +1,59 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from events import images, rsvp, search
+from events.fragments import bump_events_generation
+from events.models import Category, Event, WaitlistEntry
+
+
+@receiver(post_save, sender=Event)
+def index_event(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_events([instance.pk])
+
+
+@receiver(post_save, sender=Event)
+def generate_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw:
+        images.schedule_event_image(instance)
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event(sender, instance, **kwargs):
+    search.remove_events([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def reindex_category_events(sender, instance, created, raw=False, **kwargs):
+    # A new category has no events yet; a renamed one changes their documents
+    # and the category name the API serves with them.
+    if not created and not raw:
+        search.index_category(instance.pk)
+        Event.objects.filter(category_id=instance.pk).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_event_fragments(sender, **kwargs):
+    bump_events_generation()
+
+
+@receiver(m2m_changed, sender=Event.participants.through)
+def invalidate_fragments_on_rsvp(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_events_generation()
+
+
+@receiver(m2m_changed, sender=Event.participants.through)
+def leave_waitlist_on_join(sender, instance, action, reverse, pk_set, **kwargs):
+    if action != "post_add" or not pk_set:
+        return
+    if reverse:
+        # user.rsvp_events.add(...): `instance` is the user.
+        WaitlistEntry.objects.filter(user_id=instance.pk, event_id__in=pk_set).delete()
+    else:
+        rsvp.discard_seated_entries(instance.pk, pk_set)
+
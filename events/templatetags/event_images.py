@@ -0,0 +1,58 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+register = template.Library()
+
+# `sizes` tells the browser how wide the image is displayed so it can pick
+# the smallest srcset candidate that fills it; `width` is the fallback src.
+DISPLAYS = {
+    "thumbnail": {"sizes": "160px", "width": 160},
+    "card": {"sizes": "(min-width: 1024px) 25vw, (min-width: 768px) 33vw, 100vw", "width": 480},
+    "detail": {"sizes": "(min-width: 640px) 50vw, 100vw", "width": 1200},
+}
+
+
+def _srcset(names):
+    return ", ".join(
+        f"{default_storage.url(name)} {width}w"
+        for width, name in sorted(names.items(), key=lambda item: int(item[0]))
+    )
+
+
+def _closest(names, width):
+    widths = sorted(int(w) for w in names)
+    chosen = next((w for w in widths if w >= width), widths[-1])
+    return default_storage.url(names[str(chosen)])
+
+
+@register.simple_tag
+def event_picture(event, display="card", css_class=""):
+    """<picture> for the event's image sized for `display`.
+
+    Falls back to the original upload until its variants have been
+    generated.
+    """
+    variants = event.asset_variants or {}
+    if not event.asset:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="lazy">',
+            static("images/default.jpeg"), event.name, css_class,
+        )
+    if variants.get("source") != event.asset.name or not variants.get("jpeg"):
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="lazy">',
+            event.asset.url, event.name, css_class,
+        )
+
+    sizes = DISPLAYS[display]["sizes"]
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="lazy" decoding="async">'
+        '</picture>',
+        _srcset(variants["webp"]), sizes,
+        _closest(variants["jpeg"], DISPLAYS[display]["width"]), _srcset(variants["jpeg"]), sizes,
+        event.name, css_class,
+    )
@@ -1,3 +1,1050 @@
-from django.test import TestCase
+import csv
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import close_old_connections, connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from event_management.storage import StaticFilesStorage
+from events.benchmarking import seed_categories, seed_events, startup_imports
+from events import images, importing, rsvp, search
+from events.checks import check_static_manifest
+from events.forms import EventModelForm
+from events.locking import write_transaction
+from events.models import Category, Event, WaitlistEntry
+from events.pagination import InvalidCursor, encode_cursor, json_page, paginate, paginate_request
+from events.profiling import RequestProfile
+from events.templatetags import event_images
+from users.models import OutgoingEmail
+
+User = get_user_model()
+
+
+class OrganizerDashboardQueryTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user("organizer", password="pass")
+        self.organizer.groups.add(Group.objects.create(name="Organizer"))
+        self.category = Category.objects.create(name="Music")
+        self.client.force_login(self.organizer)
+
+    def create_events(self, count):
+        today = timezone.localdate()
+        for i in range(count):
+            event = Event.objects.create(
+                name=f"Event {i}",
+                date=today + timedelta(days=i - count // 2),
+                time="10:00",
+                location="Dhaka",
+                category=self.category,
+            )
+            event.participants.add(self.organizer)
+
+    def dashboard_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("organizer-dashboard"))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_independent_of_event_count(self):
+        self.create_events(3)
+        few = self.dashboard_queries()
+        self.create_events(40)
+        self.assertEqual(self.dashboard_queries(), few)
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_dashboard_query_count_is_pinned(self):
+        self.create_events(5)
+        cache.clear()
+        # session, user, group names (shared by the access check and the
+        # context processor), counters, user count, page, today's events
+        with self.assertNumQueries(7):
+            self.client.get(reverse("organizer-dashboard"))
+
+    def test_counters(self):
+        self.create_events(4)
+        counts = self.client.get(reverse("organizer-dashboard")).context["counts"]
+        self.assertEqual(counts["total_events"], 4)
+        self.assertEqual(counts["upcoming_events"] + counts["past_events"], 4)
+        self.assertEqual(counts["total_participants_all_events_sum"], 4)
+
+
+class ParticipantCountTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Music")
+        self.event = Event.objects.create(
+            name="Gig", date="2030-01-01", time="20:00", location="Dhaka", category=self.category,
+        )
+        self.users = [User.objects.create_user(f"user{i}") for i in range(3)]
+
+    def assertCount(self, expected):
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, expected)
+
+    def test_counter_follows_participant_changes(self):
+        self.event.participants.add(*self.users)
+        self.assertCount(3)
+        self.event.participants.add(self.users[0])
+        self.assertCount(3)
+        self.event.participants.remove(self.users[0], self.users[0].pk + 100)
+        self.assertCount(2)
+        self.users[1].rsvp_events.remove(self.event)
+        self.assertCount(1)
+        self.users[0].rsvp_events.add(self.event)
+        self.assertCount(2)
+        self.users[2].delete()
+        self.assertCount(1)
+        self.event.participants.clear()
+        self.assertCount(0)
+
+    def test_reconcile_repairs_drift(self):
+        self.event.participants.add(*self.users)
+        Event.objects.update(participant_count=99)
+        call_command("reconcile_participant_counts", stdout=StringIO())
+        self.assertCount(3)
+
+
+class RsvpTests(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(
+            name="Gig", date="2030-01-01", time="20:00", location="Dhaka",
+            category=Category.objects.create(name="Music"), capacity=2,
+        )
+        self.users = [User.objects.create_user(f"user{i}") for i in range(3)]
+
+    def test_capacity_is_enforced(self):
+        self.assertEqual(rsvp.rsvp(self.event.pk, self.users[0]), rsvp.JOINED)
+        self.assertEqual(rsvp.rsvp(self.event.pk, self.users[0]), rsvp.ALREADY_JOINED)
+        self.assertEqual(rsvp.rsvp(self.event.pk, self.users[1]), rsvp.JOINED)
+        self.assertEqual(rsvp.rsvp(self.event.pk, self.users[2], waitlist=False), rsvp.SOLD_OUT)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 2)
+        self.assertTrue(self.event.is_full)
+
+    def test_cancel_promotes_from_waitlist_in_order(self):
+        late = User.objects.create_user("late", email="late@example.com")
+        rsvp.rsvp(self.event.pk, self.users[0])
+        rsvp.rsvp(self.event.pk, self.users[1])
+        self.assertEqual(rsvp.rsvp(self.event.pk, self.users[2]), rsvp.WAITLISTED)
+        self.assertEqual(rsvp.rsvp(self.event.pk, self.users[2]), rsvp.ALREADY_WAITLISTED)
+        rsvp.rsvp(self.event.pk, late)
+        self.assertEqual(rsvp.waitlist_position(self.event.pk, late), 2)
+
+        self.assertEqual(rsvp.cancel_rsvp(self.event.pk, self.users[0]), rsvp.CANCELLED)
+        self.assertEqual(rsvp.cancel_rsvp(self.event.pk, self.users[0]), rsvp.NOT_JOINED)
+        self.assertTrue(self.event.participants.filter(pk=self.users[2].pk).exists())
+        self.assertEqual(rsvp.waitlist_position(self.event.pk, late), 1)
+
+        self.assertEqual(rsvp.cancel_rsvp(self.event.pk, self.users[1]), rsvp.CANCELLED)
+        self.assertTrue(
+            OutgoingEmail.objects.filter(to=["late@example.com"], subject="RSVP Confirmation — Gig").exists()
+        )
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.participant_count, 2)
+        self.assertFalse(WaitlistEntry.objects.exists())
+
+    def test_raising_capacity_promotes(self):
+        for user in self.users:
+            rsvp.rsvp(self.event.pk, user)
+        self.event.capacity = 3
+        self.event.save()
+        self.assertEqual(len(rsvp.promote_waitlist(self.event.pk)), 1)
+        self.assertEqual(self.event.participants.count(), 3)
+
+    def test_users_seated_directly_leave_the_waitlist(self):
+        late = User.objects.create_user("late")
+        for user in self.users + [late]:
+            rsvp.rsvp(self.event.pk, user)
+        # The organizer seats the first queued user by hand.
+        rsvp.sync_participants(self.event, [self.users[0].pk, self.users[1].pk, self.users[2].pk])
+        self.assertEqual(rsvp.waitlist_position(self.event.pk, late), 1)
+        # An entry left behind by older code must not swallow the next seat.
+        WaitlistEntry.objects.create(
+            event=self.event, user=self.users[1], created_at=timezone.now() - timedelta(days=1),
+        )
+        rsvp.cancel_rsvp(self.event.pk, self.users[0])
+        rsvp.cancel_rsvp(self.event.pk, self.users[2])
+        self.assertEqual(
+            set(self.event.participants.values_list("pk", flat=True)), {self.users[1].pk, late.pk},
+        )
+        self.assertFalse(WaitlistEntry.objects.exists())
+
+    def test_freed_seats_go_to_the_queue_before_newcomers(self):
+        late, newcomer = User.objects.create_user("late"), User.objects.create_user("newcomer")
+        for user in self.users + [late]:
+            rsvp.rsvp(self.event.pk, user)
+        # A deleted account frees its seat for the head of the queue.
+        self.users[0].delete()
+        self.assertTrue(self.event.participants.filter(pk=self.users[2].pk).exists())
+        # A seat freed behind rsvp()'s back is still not up for grabs.
+        Event.participants.through.objects.filter(event_id=self.event.pk, customuser_id=self.users[1].pk).delete()
+        Event.objects.filter(pk=self.event.pk).recount_participants()
+        self.assertEqual(rsvp.rsvp(self.event.pk, newcomer), rsvp.WAITLISTED)
+        self.assertTrue(self.event.participants.filter(pk=late.pk).exists())
+        self.assertEqual(rsvp.waitlist_position(self.event.pk, newcomer), 1)
+
+    def test_cancel_cost_does_not_grow_with_the_waitlist(self):
+        def cancel_queries(queued):
+            for user in self.users[:2]:
+                rsvp.rsvp(self.event.pk, user)
+            for i in range(queued):
+                rsvp.rsvp(self.event.pk, User.objects.create_user(f"queued{queued}-{i}"))
+            with CaptureQueriesContext(connection) as queries:
+                rsvp.cancel_rsvp(self.event.pk, self.users[0])
+            Event.participants.through.objects.all().delete()
+            WaitlistEntry.objects.all().delete()
+            Event.objects.filter(pk=self.event.pk).recount_participants()
+            return [query["sql"] for query in queries]
+
+        few = cancel_queries(2)
+        self.assertEqual(len(cancel_queries(30)), len(few))
+        self.assertFalse([sql for sql in few if "events_waitlistentry" in sql and "IN (SELECT" in sql])
+
+    def test_full_event_page_offers_waitlist(self):
+        rsvp.rsvp(self.event.pk, self.users[0])
+        rsvp.rsvp(self.event.pk, self.users[1])
+        self.client.force_login(self.users[2])
+        url = reverse("event-detail", args=[self.event.pk])
+        self.assertContains(self.client.get(url), "Join Waitlist")
+        response = self.client.post(url, {"action": "rsvp"}, follow=True)
+        self.assertContains(response, "number 1 on the waitlist")
+        self.assertFalse(self.event.participants.filter(pk=self.users[2].pk).exists())
+
+
+class SyncParticipantsTests(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(
+            name="Gig", date="2030-01-01", time="20:00", location="Dhaka",
+            category=Category.objects.create(name="Music"),
+        )
+        self.users = [User.objects.create_user(f"user{i}", email=f"user{i}@example.com") for i in range(40)]
+        self.ids = [user.pk for user in self.users]
+
+    def sync(self, ids):
+        with CaptureQueriesContext(connection) as queries:
+            added, removed = rsvp.sync_participants(self.event, ids)
+        self.event.refresh_from_db()
+        return added, removed, len(queries)
+
+    def test_only_the_difference_is_applied(self):
+        self.event.participants.add(*self.ids[:10])
+        OutgoingEmail.objects.all().delete()
+        added, removed, _ = self.sync(self.ids[5:15])
+        self.assertEqual((added, removed), (set(self.ids[10:15]), set(self.ids[:5])))
+        self.assertEqual(set(self.event.participants.values_list("pk", flat=True)), set(self.ids[5:15]))
+        self.assertEqual(self.event.participant_count, 10)
+        self.assertEqual(
+            sorted(email.to[0] for email in OutgoingEmail.objects.all()),
+            sorted(f"user{i}@example.com" for i in range(10, 15)),
+        )
+        self.assertEqual(self.sync(self.ids[5:15])[:2], (set(), set()))
+
+    def test_query_count_does_not_grow_with_the_list(self):
+        self.event.participants.add(*self.ids[:4])
+        few = self.sync(self.ids[2:6])[2]
+        self.event.participants.add(*self.ids[6:30])
+        self.assertEqual(self.sync(self.ids[10:40])[2], few)
+
+    def test_chunks_follow_the_parameter_limit(self):
+        ids = self.ids[:5]
+        # Like PostgreSQL: no parameter limit, bulk inserts in one batch.
+        with mock.patch.object(connection.features, "max_query_params", None), \
+                mock.patch.object(connection.ops, "bulk_batch_size", lambda fields, objs: len(objs)):
+            self.assertEqual(list(rsvp._chunks(ids[:1])), [ids[:1]])
+            self.assertEqual(list(rsvp._chunks(ids)), [ids])
+            self.assertEqual(rsvp.change_participants(self.event, add=ids[:1]), ({ids[0]}, set()))
+        with mock.patch.object(connection.features, "max_query_params", 3):
+            self.assertEqual(list(rsvp._chunks(ids)), [ids[:2], ids[2:4], ids[4:]])
+        with mock.patch.object(connection.features, "max_query_params", 1):
+            self.assertEqual(len(list(rsvp._chunks(ids))), 5)
+
+
+class RsvpConcurrencyTests(TransactionTestCase):
+    def run_concurrently(self, calls):
+        start = threading.Barrier(len(calls))
+        errors = []
+
+        def run(func, *args):
+            start.wait()
+            try:
+                func(*args)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=run, args=call) for call in calls]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_no_overbooking_and_no_lost_promotions(self):
+        event = Event.objects.create(
+            name="Gig", date="2030-01-01", time="20:00", location="Dhaka",
+            category=Category.objects.create(name="Music"), capacity=5, asset="",
+        )
+        users = [User.objects.create_user(f"user{i}") for i in range(15)]
+        seated, queued, late = users[:5], users[5:10], users[10:]
+
+        self.run_concurrently([(rsvp.rsvp, event.pk, user) for user in seated + queued])
+        self.assertEqual(event.participants.count(), 5)
+        self.assertEqual(WaitlistEntry.objects.filter(event=event).count(), 5)
+        first_five = set(event.participants.values_list("pk", flat=True))
+        queued = [user for user in seated + queued if user.pk not in first_five]
+        seated = [user for user in users[:10] if user.pk in first_five]
+
+        # Every seated user cancels while latecomers keep RSVPing.
+        self.run_concurrently(
+            [(rsvp.cancel_rsvp, event.pk, user) for user in seated]
+            + [(rsvp.rsvp, event.pk, user) for user in late]
+        )
+        event.refresh_from_db()
+        self.assertEqual(event.participant_count, 5)
+        self.assertEqual(
+            set(event.participants.values_list("pk", flat=True)), {user.pk for user in queued},
+        )
+        self.assertEqual(
+            set(WaitlistEntry.objects.filter(event=event).values_list("user", flat=True)),
+            {user.pk for user in late},
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "BEGIN IMMEDIATE is SQLite syntax")
+    def test_only_writers_take_the_lock_up_front(self):
+        Category.objects.create(name="Music")
+        with CaptureQueriesContext(connection) as queries:
+            search.search_event_ids("music")
+            with transaction.atomic():
+                Category.objects.count()
+            with write_transaction():
+                Category.objects.count()
+        begins = [q["sql"] for q in queries if q["sql"].startswith("BEGIN")]
+        self.assertEqual(begins, ["BEGIN", "BEGIN IMMEDIATE"])
+
+
+class HomeGridCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Music")
+
+    def create_event(self, name):
+        return Event.objects.create(
+            name=name, date="2030-01-01", time="20:00", location="Dhaka", category=self.category,
+        )
+
+    def test_grid_is_served_from_cache(self):
+        self.create_event("Jazz Night")
+        self.client.get(reverse("home"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("home"))
+        self.assertContains(response, "Jazz Night")
+
+    @override_settings(HOME_GRID_CACHE_TIMEOUT=0)
+    def test_timeout_is_read_at_call_time(self):
+        self.create_event("Jazz Night")
+        self.client.get(reverse("home"))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("home"))
+        self.assertTrue(queries)
+
+    def test_edits_are_visible_immediately(self):
+        event = self.create_event("Jazz Night")
+        self.assertContains(self.client.get(reverse("home")), "Jazz Night")
+
+        event.name = "Blues Night"
+        event.save()
+        self.assertContains(self.client.get(reverse("home")), "Blues Night")
+
+        event.delete()
+        self.assertNotContains(self.client.get(reverse("home")), "Blues Night")
+
+    def test_cache_is_keyed_by_query_string(self):
+        self.create_event("Jazz Night")
+        self.create_event("Rock Night")
+        self.assertContains(self.client.get(reverse("home"), {"q": "rock"}), "Rock Night")
+        self.assertNotContains(self.client.get(reverse("home"), {"q": "jazz"}), "Rock Night")
+
+    def test_unknown_params_share_the_cached_grid(self):
+        self.create_event("Rock Night")
+        self.client.get(reverse("home"), {"q": "rock", "utm_source": "mail"})
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("home"), {"utm_campaign": "spring", "q": " rock ", "after": ""})
+        self.assertContains(response, "Rock Night")
+
+    def test_cached_page_links_carry_only_the_grid_params(self):
+        for i in range(30):
+            self.create_event(f"Rock Night {i}")
+        response = self.client.get(reverse("home"), {"q": "rock", "utm_source": "mail"})
+        self.assertContains(response, "after=")
+        self.assertNotContains(response, "utm_source")
+
+
+class GenerateDataTests(TestCase):
+    def test_generates_consistent_data(self):
+        call_command(
+            "generate_data", categories=3, events=40, users=20, rsvps=100, batch_size=7,
+            stdout=StringIO(),
+        )
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(Event.objects.count(), 40)
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(User.objects.filter(groups=None).count(), 0)
+        # Even at 20 users and a 2% ratio there is an organizer to log in as.
+        self.assertEqual(User.objects.filter(groups__name="Organizer").count(), 1)
+        self.assertTrue(User.objects.get(username__endswith="-1").check_password("password"))
+        call_command("generate_data", categories=0, events=0, users=2, rsvps=0, user_prefix="fan", stdout=StringIO())
+        self.assertEqual(User.objects.filter(username__in=["fan1", "fan2"]).count(), 2)
+        self.assertFalse(Event.objects.with_stale_participant_count().exists())
+        self.assertGreater(Event.participants.through.objects.count(), 50)
+
+
+class RequestProfilingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Music")
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_sampled_request_is_logged_with_server_timing(self):
+        with self.assertLogs("events.profiling", "INFO") as logs:
+            response = self.client.get(reverse("home"))
+        self.assertIn("view=events.views.home", logs.output[0])
+        self.assertRegex(response["Server-Timing"], r'^sql;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, total;dur=')
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_unsampled_request_is_untouched(self):
+        response = self.client.get(reverse("home"))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_repeated_statements_are_flagged(self):
+        events = [
+            Event.objects.create(
+                name=f"Event {i}", date="2030-01-01", time="20:00", location="Dhaka", category=self.category,
+            )
+            for i in range(4)
+        ]
+        profile = RequestProfile()
+        with connection.execute_wrapper(profile):
+            for event in Event.objects.filter(pk__in=[e.pk for e in events]):
+                event.category.name
+            list(Event.objects.filter(pk__in=[events[0].pk, events[1].pk]))
+            list(Event.objects.filter(pk__in=[events[2].pk]))
+        [(shape, count)] = profile.repeated_queries(3)
+        self.assertIn('FROM "events_category"', shape)
+        self.assertEqual(count, 4)
+        self.assertEqual(profile.queries, 7)
+
+
+class ApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Music")
+        self.event = Event.objects.create(
+            name="Gig", date="2030-01-01", time="20:00", location="Dhaka",
+            category=self.category, capacity=1,
+        )
+        self.organizer = User.objects.create_user("organizer")
+        self.organizer.user_permissions.add(
+            *Permission.objects.filter(codename__in=["add_event", "change_event"])
+        )
+        self.url = reverse("api-event", args=[self.event.pk])
+
+    def test_list_etag_follows_rows_and_clock(self):
+        url = reverse("api-events")
+        response = self.client.get(url, {"type": "upcoming"})
+        self.assertEqual(response.json()["results"][0]["seats_left"], 1)
+        etag = response["ETag"]
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"type": "upcoming", "utm_source": "x"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get(url, {"type": "past"}).json()["results"], [])
+
+        # Once the event has started it belongs to the past list.
+        started = timezone.make_aware(datetime(2030, 1, 1, 21, 0))
+        with mock.patch("django.utils.timezone.now", return_value=started):
+            self.assertEqual(self.client.get(url, {"type": "upcoming"}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+            self.assertEqual(len(self.client.get(url, {"type": "past"}).json()["results"]), 1)
+
+        etag = self.client.get(url)["ETag"]
+        self.category.name = "Jazz"
+        self.category.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.json()["results"][0]["category"]["name"], "Jazz")
+
+    def test_category_etag_follows_rows(self):
+        url = reverse("api-categories")
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Category.objects.filter(pk=self.category.pk).update(name="Jazz")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_event_validators_follow_rsvps(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code, 304,
+        )
+        self.client.force_login(User.objects.create_user("fan"))
+        self.assertEqual(self.client.post(reverse("api-event-rsvp", args=[self.event.pk])).json(), {
+            "status": rsvp.JOINED, "waitlist_position": None,
+        })
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_writes_need_permission(self):
+        payload = {"name": "New", "date": "2030-02-01", "time": "10:00", "location": "Dhaka",
+                   "category": self.category.pk}
+        url = reverse("api-events")
+        self.assertEqual(self.client.post(url, payload, content_type="application/json").status_code, 401)
+        self.client.force_login(User.objects.create_user("fan"))
+        self.assertEqual(self.client.post(url, payload, content_type="application/json").status_code, 403)
+        self.client.force_login(self.organizer)
+        response = self.client.post(url, payload, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.get(response["Location"]).json()["name"], "New")
+
+    def test_patch_validates_and_honours_if_match(self):
+        self.client.force_login(self.organizer)
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.patch(self.url, {"capacity": -1}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("capacity", response.json()["fields"])
+        response = self.client.patch(
+            self.url, {"name": "Renamed"}, content_type="application/json", HTTP_IF_MATCH=etag,
+        )
+        self.assertEqual(response.json()["name"], "Renamed")
+        response = self.client.patch(
+            self.url, {"name": "Stale"}, content_type="application/json", HTTP_IF_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 412)
+
+    def test_rsvp_waitlist(self):
+        rsvp.rsvp(self.event.pk, self.organizer)
+        self.client.force_login(User.objects.create_user("fan"))
+        url = reverse("api-event-rsvp", args=[self.event.pk])
+        self.assertEqual(self.client.post(url).json(), {"status": rsvp.WAITLISTED, "waitlist_position": 1})
+        self.assertEqual(self.client.get(url).json()["status"], rsvp.WAITLISTED)
+        self.assertEqual(self.client.delete(url).json()["status"], rsvp.LEFT_WAITLIST)
+        self.assertEqual(self.client.get(url).json()["status"], rsvp.NOT_JOINED)
+
+
+class ImportTests(TestCase):
+    CSV = (
+        "name,description,category,location,date,time,capacity\n"
+        "Jazz night,\"Live, loud\",Music,Dhaka,2030-01-01,20:00,50\n"
+        "Broken,,Nope,Dhaka,someday,20:00,\n"
+        "Quiet evening,,Music,Khulna,2030-01-02,19:30,\n"
+    )
+
+    def setUp(self):
+        self.category = Category.objects.create(name="Music")
+
+    def test_json_rows_streams_arrays_and_json_lines(self):
+        rows = [{"name": f"Event {i}", "n": i} for i in range(20)]
+        for text in (json.dumps(rows), "\n".join(json.dumps(row) for row in rows)):
+            self.assertEqual(list(importing.json_rows(StringIO(text), chunk_size=7)), rows)
+        with self.assertRaises(importing.ImportFormatError):
+            list(importing.json_rows(StringIO('[{"name": "x"}'), chunk_size=7))
+
+    def test_import_reports_bad_rows_and_batches_inserts(self):
+        rows = [
+            {"name": f"Event {i}", "category": "Music", "location": "Dhaka", "date": "2030-01-01",
+             "time": "10:00"}
+            for i in range(250)
+        ]
+        rows[10] = "not an object"
+        with CaptureQueriesContext(connection) as queries:
+            report = importing.import_events(rows, batch_size=100)
+        self.assertEqual((report.imported, report.failed), (249, 1))
+        self.assertEqual(report.errors[0][0], 11)
+        self.assertEqual(Event.objects.count(), 249)
+        # One category lookup, then a few inserts and an index update per
+        # batch of 100, never a query per row.
+        self.assertLess(len(queries), 30)
+        if search.is_supported():
+            self.assertEqual(search.search_event_ids("Event 42"), [Event.objects.get(name="Event 42").pk])
+
+    def test_upload_view(self):
+        organizer = User.objects.create_user("organizer")
+        organizer.user_permissions.add(Permission.objects.get(codename="add_event"))
+        self.client.force_login(organizer)
+        upload = SimpleUploadedFile("events.csv", self.CSV.encode())
+        response = self.client.post(reverse("import_events"), {"file": upload, "dry_run": "on"})
+        self.assertEqual(response.context["report"].imported, 2)
+        self.assertFalse(Event.objects.exists())
+
+        upload = SimpleUploadedFile("events.csv", self.CSV.encode())
+        report = self.client.post(reverse("import_events"), {"file": upload}).context["report"]
+        self.assertEqual(report.failed, 1)
+        self.assertEqual(set(report.errors[0][1]), {"category", "date"})
+        self.assertEqual(Event.objects.get(name="Jazz night").capacity, 50)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user("organizer")
+        self.organizer.groups.add(Group.objects.create(name="Organizer"))
+        self.category = Category.objects.create(name="Music")
+        self.event = Event.objects.create(
+            name="=HYPERLINK(1)", date="2030-01-01", time="20:00", location="Dhaka", category=self.category,
+        )
+        Event.objects.create(
+            name="Old gig", date="2020-01-01", time="20:00", location="Dhaka", category=self.category,
+        )
+        self.event.participants.add(*[
+            User.objects.create_user(f"fan{i}", email=f"fan{i}@example.com") for i in range(3)
+        ])
+        self.client.force_login(self.organizer)
+
+    def rows(self, response):
+        self.assertTrue(response.streaming)
+        return list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+
+    def test_event_export_uses_dashboard_filters(self):
+        rows = self.rows(self.client.get(reverse("export-events"), {"type": "upcoming"}))
+        self.assertEqual(rows[0][:3], ["id", "name", "category"])
+        self.assertEqual(len(rows), 2)
+        # Formulas are neutralised for spreadsheet programs.
+        self.assertEqual(rows[1][1:3], ["'=HYPERLINK(1)", "Music"])
+        self.assertEqual(rows[1][6], "3")
+
+    def test_attendee_export(self):
+        response = self.client.get(reverse("export-attendees", args=[self.event.pk]))
+        self.assertIn(f"event-{self.event.pk}-attendees.csv", response["Content-Disposition"])
+        rows = self.rows(response)
+        self.assertEqual([row[1] for row in rows[1:]], ["fan0", "fan1", "fan2"])
+        self.assertEqual(self.client.get(reverse("export-attendees", args=[0])).status_code, 404)
+
+    def test_participants_cannot_export(self):
+        self.client.force_login(User.objects.get(username="fan0"))
+        self.assertEqual(self.client.get(reverse("export-events")).status_code, 302)
+
+
+class ParticipantPickerTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_superuser("organizer")
+        self.client.force_login(self.organizer)
+        self.category = Category.objects.create(name="Music")
+        self.users = [User.objects.create_user(f"user{i}") for i in range(5)]
+
+    def test_form_only_renders_selected_users(self):
+        event = Event.objects.create(
+            name="Gig", date="2030-01-01", time="20:00", location="Dhaka", category=self.category,
+        )
+        event.participants.add(self.users[0])
+        url = reverse("update_event", args=[event.pk])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as few:
+            response = self.client.get(url)
+        self.assertContains(response, "user0")
+        self.assertNotContains(response, "user1")
+        for i in range(5, 50):
+            User.objects.create_user(f"user{i}")
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(url)
+        self.assertEqual(len(many), len(few))
+
+    def test_submitted_ids_are_checked_in_one_query(self):
+        field = EventModelForm().fields["participants"]
+        ids = [str(user.pk) for user in self.users[:3]]
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                field.clean({"add": ids + ids[:1], "remove": ["0"]}),
+                {"add": [user.pk for user in self.users[:3]], "remove": [0]},
+            )
+        with self.assertRaises(ValidationError):
+            field.clean({"add": ids + ["0"]})
+        with self.assertRaises(ValidationError):
+            field.clean({"add": ["x"]})
+        with self.assertRaises(ValidationError):
+            field.clean({"remove": ["x"]})
+
+    def test_create_event_saves_participants(self):
+        self.client.post(reverse("create_event"), {
+            "name": "Gig", "description": "Loud", "category": self.category.pk, "location": "Dhaka",
+            "date": "2030-01-01", "time": "20:00", "participants_add": [self.users[1].pk, self.users[2].pk],
+        })
+        event = Event.objects.get(name="Gig")
+        self.assertEqual(set(event.participants.all()), {self.users[1], self.users[2]})
+
+    def test_edit_posts_only_the_change(self):
+        event = Event.objects.create(
+            name="Gig", description="Loud", date="2030-01-01", time="20:00", location="Dhaka",
+            category=self.category,
+        )
+        crowd = [User.objects.create_user(f"fan{i:02}") for i in range(30)]
+        event.participants.add(*crowd)
+        url = reverse("update_event", args=[event.pk])
+        response = self.client.get(url)
+        # The first page of participants, the rest is fetched on demand.
+        self.assertContains(response, "fan19")
+        self.assertNotContains(response, "fan20")
+        self.assertContains(response, f'data-event="{event.pk}"')
+        after = re.search(r'data-more="([^"]+)"', response.content.decode()).group(1)
+        rest = self.client.get(reverse("user-search"), {"event": event.pk, "after": after}).json()
+        self.assertEqual(len(rest["results"]), 10)
+        response = self.client.post(url, {
+            "name": "Gig", "description": "Loud", "category": self.category.pk, "location": "Dhaka",
+            "date": "2030-01-01", "time": "20:00",
+            "participants_add": [self.users[0].pk, crowd[0].pk], "participants_remove": [crowd[25].pk],
+        })
+        self.assertEqual(response.status_code, 302)
+        event.refresh_from_db()
+        self.assertEqual(event.participant_count, 30)
+        self.assertTrue(event.participants.filter(pk=self.users[0].pk).exists())
+        self.assertFalse(event.participants.filter(pk=crowd[25].pk).exists())
+
+    def test_users_added_here_leave_the_waitlist(self):
+        event = Event.objects.create(
+            name="Gig", description="Loud", date="2030-01-01", time="20:00", location="Dhaka",
+            category=self.category, capacity=1, asset="",
+        )
+        for user in self.users[:3]:
+            rsvp.rsvp(event.pk, user)
+        form = EventModelForm({
+            "name": "Gig", "description": "Loud", "category": self.category.pk, "location": "Dhaka",
+            "date": "2030-01-01", "time": "20:00", "capacity": 1, "participants_add": [str(self.users[2].pk)],
+        }, instance=event)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertEqual(list(WaitlistEntry.objects.values_list("user_id", flat=True)), [self.users[1].pk])
+
+    def test_participant_pages(self):
+        event = Event.objects.create(
+            name="Gig", date="2030-01-01", time="20:00", location="Dhaka", category=self.category,
+        )
+        event.participants.add(*self.users[1:4])
+        page = self.client.get(reverse("user-search"), {"event": event.pk}).json()
+        self.assertEqual([user["label"] for user in page["results"]], ["user1", "user2", "user3"])
+        page = self.client.get(reverse("user-search"), {"event": event.pk, "q": "user2"}).json()
+        self.assertEqual([user["label"] for user in page["results"]], ["user2"])
+        self.assertEqual(self.client.get(reverse("user-search"), {"event": 0}).status_code, 404)
+
+
+@skipUnless(search.is_supported(), "needs full-text search")
+class SearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name="Music")
+
+    def create_event(self, name, description="", **fields):
+        return Event.objects.create(
+            name=name, description=description, date="2030-01-01", time="20:00", location="Dhaka",
+            category=fields.pop("category", self.category), **fields,
+        )
+
+    def test_index_follows_events_and_categories(self):
+        event = self.create_event("Jazz Night")
+        self.assertEqual(search.search_event_ids("jazz"), [event.pk])
+        event.name = "Blues Night"
+        event.save()
+        self.assertEqual(search.search_event_ids("jazz"), [])
+        self.assertEqual(search.search_event_ids("blues"), [event.pk])
+
+        self.category.name = "Concerts"
+        self.category.save()
+        self.assertEqual(search.search_event_ids("concerts"), [event.pk])
+        self.assertEqual(search.search_event_ids("music"), [])
+
+        event.delete()
+        self.assertEqual(search.search_event_ids("blues"), [])
+
+    def test_prefix_matches_ranked_by_field(self):
+        in_description = self.create_event("Evening talk", "A conference warm-up in Berlin.")
+        in_name = self.create_event("Conference Berlin")
+        self.create_event("Conference Paris")
+        self.assertEqual(search.search_event_ids("conf berl"), [in_name.pk, in_description.pk])
+
+    def test_ranked_results_are_paged(self):
+        ids = {self.create_event(f"Rock night {i}").pk for i in range(30)}
+        first = search.ranked_page("rock", page_size=20)
+        self.assertIsNone(first.previous_cursor)
+        second = search.ranked_page("rock", after=first.next_cursor, page_size=20)
+        self.assertIsNone(second.next_cursor)
+        self.assertEqual(set(first.items) | set(second.items), ids)
+        self.assertEqual(search.ranked_page("rock", before=second.previous_cursor, page_size=20).items, first.items)
+
+        response = self.client.get(reverse("home"), {"q": "rock", "format": "json", "after": first.next_cursor})
+        self.assertEqual([row["id"] for row in response.json()["results"]], second.items)
+        for cursor in ("garbage", first.next_cursor[:-2]):
+            response = self.client.get(reverse("home"), {"q": "rock", "after": cursor})
+            self.assertEqual(response.status_code, 200)
+
+    def test_falls_back_to_icontains(self):
+        self.create_event("Rock Night")
+        with mock.patch("events.search.is_supported", return_value=False):
+            self.assertContains(self.client.get(reverse("home"), {"q": "ock"}), "Rock Night")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {search.SEARCH_TABLE}")
+        with self.assertLogs("events.search", "WARNING"):
+            self.assertIsNone(search.ranked_page("rock"))
+            cache.clear()
+            self.assertContains(self.client.get(reverse("home"), {"q": "ock"}), "Rock Night")
+
+
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=root, EVENT_IMAGE_ASYNC=False))
+        self.category = Category.objects.create(name="Music")
+
+    def upload(self, width, height=None, name="poster.png"):
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new("RGB", (width, height or width // 2), "navy").save(buffer, "PNG")
+        return SimpleUploadedFile(name, buffer.getvalue())
+
+    def create_event(self, asset):
+        with self.captureOnCommitCallbacks(execute=True):
+            event = Event.objects.create(
+                name="Gig", date="2030-01-01", time="20:00", location="Dhaka", category=self.category, asset=asset,
+            )
+        event.refresh_from_db()
+        return event
+
+    def test_variants_are_named_by_content(self):
+        upload = self.upload(1000)
+        event = self.create_event(upload)
+        self.assertFalse(images.needs_variants(event))
+        self.assertEqual(sorted(event.asset_variants["jpeg"], key=int), ["160", "480", "960"])
+        digest = hashlib.sha256(upload.file.getvalue()).hexdigest()[:16]
+        name = event.asset_variants["webp"]["480"]
+        self.assertEqual(name, f"{images.VARIANT_DIR}/{digest}-480w.webp")
+        self.assertTrue(default_storage.exists(name))
+
+        # The same bytes under another name reuse the files.
+        copy = self.create_event(SimpleUploadedFile("copy.png", upload.file.getvalue()))
+        self.assertEqual(copy.asset_variants["webp"], event.asset_variants["webp"])
+
+        event.asset = self.upload(200, name="new.png")
+        self.assertTrue(images.needs_variants(event))
+        event.asset = None
+        self.assertFalse(images.needs_variants(event))
+
+    def test_small_images_are_not_upscaled(self):
+        from PIL import Image
+
+        event = self.create_event(self.upload(100))
+        self.assertEqual(list(event.asset_variants["jpeg"]), ["100"])
+        with default_storage.open(event.asset_variants["jpeg"]["100"]) as variant:
+            self.assertEqual(Image.open(variant).width, 100)
+
+    def test_picture_markup(self):
+        template = Template('{% load event_images %}{% event_picture event "card" "cover" %}')
+        event = self.create_event(self.upload(1000))
+        html = template.render(Context({"event": event}))
+        webp = event.asset_variants["webp"]
+        self.assertIn(
+            f'srcset="/media/{webp["160"]} 160w, /media/{webp["480"]} 480w, /media/{webp["960"]} 960w"', html,
+        )
+        self.assertIn(f'src="/media/{event.asset_variants["jpeg"]["480"]}"', html)
+        self.assertIn(f'sizes="{event_images.DISPLAYS["card"]["sizes"]}"', html)
+
+        # Until the variants exist, the original upload is shown.
+        event.asset_variants = {}
+        html = template.render(Context({"event": event}))
+        self.assertNotIn("srcset", html)
+        self.assertIn(f'src="{event.asset.url}"', html)
+
+
+class PaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Music")
+        # Repeated dates and times, so pages split inside runs of equal values.
+        for i in range(7):
+            Event.objects.create(
+                name=f"Event {i}", date=f"2030-01-0{1 + i % 2}", time=f"{18 + i % 3}:00", location="Dhaka",
+                category=category,
+            )
+
+    def walk(self, ordering, page_size=3):
+        """Page through every event forwards, then back from the last page."""
+        pages = [paginate(Event.objects.all(), ordering, page_size=page_size)]
+        while pages[-1].has_next:
+            pages.append(paginate(Event.objects.all(), ordering, after=pages[-1].next_cursor, page_size=page_size))
+        backwards = [pages[-1]]
+        while backwards[-1].has_previous:
+            backwards.append(
+                paginate(Event.objects.all(), ordering, before=backwards[-1].previous_cursor, page_size=page_size)
+            )
+        ids = lambda pages: [[event.pk for event in page] for page in pages]
+        self.assertEqual(ids(backwards), ids(reversed(pages)))
+        return [pk for page in ids(pages) for pk in page]
+
+    def test_forward_and_back_in_either_direction(self):
+        expected = list(Event.objects.order_by("date", "time", "id").values_list("id", flat=True))
+        self.assertEqual(self.walk(("date", "time", "id")), expected)
+        self.assertEqual(self.walk(("-date", "-time", "-id")), expected[::-1])
+        mixed = list(Event.objects.order_by("-date", "time", "id").values_list("id", flat=True))
+        self.assertEqual(self.walk(("-date", "time", "id"), page_size=2), mixed)
+
+        first = paginate(Event.objects.all(), ("date", "time", "id"), page_size=3)
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+    def test_invalid_cursors(self):
+        ordering = ("date", "time", "id")
+        for cursor in ("garbage", encode_cursor([1, 2]), encode_cursor(["never", "20:00", 1]), "e30"):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                paginate(Event.objects.all(), ordering, after=cursor)
+
+        request = RequestFactory().get("/", {"after": "garbage"})
+        self.assertEqual(len(paginate_request(request, Event.objects.all(), ordering, page_size=5)), 5)
+        self.assertEqual(self.client.get(reverse("api-events"), {"after": "garbage"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("home"), {"before": encode_cursor([None])}).status_code, 200)
+
+    def test_json_page(self):
+        rows = Event.objects.values("id", "name")
+        page = paginate(rows, ("name", "id"), page_size=2)
+        data = json.loads(json_page(page).content)
+        self.assertEqual([row["name"] for row in data["results"]], ["Event 0", "Event 1"])
+        self.assertEqual(data["next"], page.next_cursor)
+        self.assertIsNone(data["previous"])
+        data = json.loads(json_page(paginate(rows, ("name", "id"), after=data["next"], page_size=2), dict).content)
+        self.assertEqual([row["name"] for row in data["results"]], ["Event 2", "Event 3"])
+        self.assertIsNotNone(data["previous"])
+
+
+class StartupTests(SimpleTestCase):
+    # About 4x what a cold start of the prod profile takes on a laptop.
+    BUDGET_MS = 1500
+    DEV_ONLY = ("debug_toolbar", "PIL", "sendgrid", "sendgrid_backend")
+
+    def test_prod_startup(self):
+        imports, total = startup_imports("event_management.settings.prod")
+        loaded = {name.split(".")[0] for name in imports}
+        self.assertFalse(loaded & set(self.DEV_ONLY), "imported at startup")
+        self.assertLess(total / 1000, self.BUDGET_MS)
+
+    def test_static_urls_before_collectstatic(self):
+        with tempfile.TemporaryDirectory() as root:
+            storage = StaticFilesStorage(location=root, base_url="/static/")
+            self.assertEqual(storage.url("css/output.css"), "/static/css/output.css")
+
+    def test_missing_manifest_fails_deploy_checks(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(STATIC_ROOT=root):
+            self.assertEqual([error.id for error in check_static_manifest(None)], ["events.E001"])
+            with open(os.path.join(root, "staticfiles.json"), "w") as manifest:
+                manifest.write('{"paths": {}, "version": "1.1"}')
+            self.assertEqual(check_static_manifest(None), [])
+
+
+class StatementRecorder:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class QueryPlanTests(TestCase):
+    """Every listing query must be answered from an index, never a table scan."""
+
+    # A plain table scan, or a walk over a whole index (SCAN ... USING
+    # [COVERING] INDEX); SEARCH lines are index lookups and pass. An index
+    # walk is only accepted when it delivers the ORDER BY of a LIMITed
+    # statement, i.e. a page read in index order that stops when full.
+    FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(events_\w+)(?P<index> USING (?:COVERING )?INDEX \w+)?$")
+    LIMITED = re.compile(r"\bLIMIT \d+$")
+    # The organizer dashboard counters aggregate over every event by
+    # definition; that one statement is allowed to read the whole table.
+    WHOLE_TABLE_AGGREGATE = 'SELECT COUNT("events_event"."id") AS "total_events"'
+
+    @classmethod
+    def setUpTestData(cls):
+        category_ids = seed_categories(20)
+        seed_events(3000, category_ids)
+        cls.category_id = category_ids[0]
+        cls.organizer = User.objects.create_user("organizer")
+        cls.organizer.groups.add(Group.objects.create(name="Organizer"))
+        cls.event = Event.objects.order_by("id").first()
+        # 50 users with 20 RSVPs each, so the planner sees a selective
+        # customuser_id like in production.
+        users = [cls.organizer] + User.objects.bulk_create(User(username=f"u{i}") for i in range(49))
+        event_ids = list(Event.objects.values_list("id", flat=True))
+        Event.participants.through.objects.bulk_create(
+            Event.participants.through(event_id=event_ids[(n * 37 + i * 11) % len(event_ids)], customuser_id=user.pk)
+            for n, user in enumerate(users)
+            for i in range(20)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.organizer)
+
+    def plans(self, url, params=None):
+        recorder = StatementRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        plans = []
+        with connection.cursor() as cursor:
+            for sql, statement_params in recorder.statements:
+                if sql.lstrip().upper().startswith("SELECT") and "events_" in sql:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", statement_params)
+                    plans.append((sql, [row[3] for row in cursor.fetchall()]))
+        self.assertTrue(plans, f"{url} ran no event queries")
+        return response, plans
+
+    def assertNoFullScans(self, url, params=None):
+        response, plans = self.plans(url, params)
+        for sql, details in plans:
+            if sql.startswith(self.WHOLE_TABLE_AGGREGATE):
+                continue
+            page_walk = self.LIMITED.search(sql) and not any("TEMP B-TREE" in detail for detail in details)
+            for detail in details:
+                scan = self.FULL_SCAN.match(detail)
+                self.assertFalse(
+                    scan and not (scan["index"] and page_walk),
+                    f"{url} {params or ''}: full scan ({detail}) in\n{sql}",
+                )
+        return response
+
+    def test_home(self):
+        response = self.assertNoFullScans(reverse("home"))
+        self.assertNoFullScans(reverse("home"), {"format": "json", "after": response.context["page"].next_cursor})
+
+    def test_organizer_dashboard(self):
+        url = reverse("organizer-dashboard")
+        for params in (
+            {},
+            {"type": "upcoming"},
+            {"type": "past"},
+            {"category": self.category_id},
+            {"category": self.category_id, "start_date": "2020-01-01", "end_date": "2040-01-01"},
+            {"type": "upcoming", "start_date": "2020-01-01", "end_date": "2040-01-01"},
+        ):
+            response = self.assertNoFullScans(url, params)
+            self.assertNoFullScans(url, {**params, "after": response.context["page"].next_cursor})
+
+    def test_user_dashboard(self):
+        url = reverse("dashboard")
+        for params in ({}, {"type": "upcoming"}, {"type": "past"}):
+            self.assertNoFullScans(url, params)
+
+    def test_event_detail(self):
+        self.assertNoFullScans(reverse("event-detail", args=[self.event.pk]))
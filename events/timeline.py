@@ -0,0 +1,62 @@
+"""Where events fall relative to the current moment.
+
+Timeline builds the upcoming / past / today predicates the dashboards filter
+and count with, all against one local-time "now" so the list and the
+counters on a page agree with each other. Each predicate carries a
+redundant inclusive bound on `date` so the (date, time, id) index can serve
+it as a range.
+"""
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When, Window
+from django.db.models.functions import Greatest, RowNumber
+from django.utils import timezone
+
+LIST_TYPES = ("all", "upcoming", "past")
+
+
+class Timeline:
+    def __init__(self, now=None):
+        self.now = timezone.localtime(now)
+        self.date = self.now.date()
+        self.time = self.now.time()
+
+    def upcoming(self):
+        return Q(date__gte=self.date) & (Q(date__gt=self.date) | Q(time__gte=self.time))
+
+    def past(self):
+        return Q(date__lte=self.date) & (Q(date__lt=self.date) | Q(time__lt=self.time))
+
+    def today(self):
+        return Q(date=self.date)
+
+    def filter(self, queryset, list_type):
+        """Narrow `queryset` to one of LIST_TYPES; "all" and unknown types pass through."""
+        if list_type == "upcoming":
+            return queryset.filter(self.upcoming())
+        if list_type == "past":
+            return queryset.filter(self.past())
+        return queryset
+
+    def counters(self, suffix):
+        """Conditional Count() aggregates named total_<suffix>, upcoming_<suffix>, ..."""
+        return {
+            f"total_{suffix}": Count("id"),
+            f"upcoming_{suffix}": Count("id", filter=self.upcoming()),
+            f"past_{suffix}": Count("id", filter=self.past()),
+            f"today_{suffix}": Count("id", filter=self.today()),
+        }
+
+    def counters_with_today(self, queryset, suffix):
+        """The counters() totals plus today's rows of `queryset` (by time), fetched in one query.
+
+        The totals ride along as window aggregates on today's rows; when
+        there are none, one other row is kept so the totals still arrive.
+        """
+        counters = {name: Window(aggregate) for name, aggregate in self.counters(suffix).items()}
+        today_first = Case(When(self.today(), then=Value(0)), default=Value(1), output_field=IntegerField())
+        rows = list(
+            queryset.annotate(**counters, slot=Window(RowNumber(), order_by=[today_first, F("time"), F("id")]))
+            .filter(slot__lte=Greatest(F(f"today_{suffix}"), 1))
+            .order_by("slot")
+        )
+        counts = {name: getattr(rows[0], name) if rows else 0 for name in counters}
+        return counts, rows[:counts[f"today_{suffix}"]]
@@ -1,5 +1,5 @@
 from django.urls import path
-from events.views import home, organizer_dashboard, create_event, update_event, delete_event, event_detail, add_category
+from events.views import home, organizer_dashboard, create_event, update_event, delete_event, event_detail, add_category, import_events, export_events, export_attendees
 
 urlpatterns = [
     path('home/', home, name='home'),
@@ -10,6 +10,9 @@ urlpatterns = [
     path("event/<int:id>/", event_detail, name="event-detail"),
     # path('add_participant/', add_participant, name='add_participant'),
     path('add_category/', add_category, name='add_category'),
+    path('import_events/', import_events, name='import_events'),
+    path("dashboard/export/", export_events, name="export-events"),
+    path("event/<int:id>/attendees.csv", export_attendees, name="export-attendees"),
    
 
 
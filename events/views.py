@@ -1,31 +1,33 @@
-from django.shortcuts import render, redirect
+import copy
+import io
+from django.shortcuts import render, redirect, get_object_or_404
+from django.http import QueryDict
 from events.models import Event, Category
 from django.utils import timezone
-from django.db.models import Q, Count,Sum
-from events.forms import EventModelForm, CategoryModelForm
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+from events.forms import EventModelForm, CategoryModelForm, EventImportUploadForm
 from datetime import date
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
 from django.contrib.auth.decorators import login_required, user_passes_test, permission_required
+from events import search
+from users.roles import is_organizer, is_participant, is_organizer_or_admin
+from events.pagination import InvalidCursor, KeysetPage, paginate_request, wants_json, json_page
+from events.profiling import query_budget
+from django.core.files.storage import default_storage
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from events.fragments import fragment_key
+from events.filters import apply_event_filters
+from events.timeline import Timeline
+from events import rsvp
+from events import exports, importing
 User = get_user_model()
 
 
-def is_admin(user):
-    return user.groups.filter(name='admin').exists()
-
-def is_organizer(user):
-    return user.groups.filter(name='Organizer').exists()
-
-def is_participant(user):
-    return user.groups.filter(name='Participant').exists()
-
-
-def is_organizer_or_admin(user):
-    return user.is_superuser or user.groups.filter(name='Organizer').exists()
-
-
 @login_required
 def dashboard(request):
     if is_organizer(request.user):
@@ -38,17 +40,68 @@ def dashboard(request):
 
 
 
-def home(request):
-    query = request.GET.get('q', '').strip()  #
-    events = Event.objects.all()
+EVENT_CARD_FIELDS = ("id", "name", "description", "location", "date", "time", "asset")
+
+
+def event_card_json(row):
+    return {**row, "asset": default_storage.url(row["asset"]) if row["asset"] else None}
+
 
+def home_events(request, events, query):
+    """The KeysetPage of events for one home grid page.
+
+    Full-text results are paged in rank order with their own cursors.
+    """
     if query:
+        after = request.GET.get("after") or None
+        before = request.GET.get("before") or None
+        try:
+            ranked = search.ranked_page(query, after=after, before=before)
+        except InvalidCursor:
+            ranked = search.ranked_page(query)
+        if ranked is not None:
+            rows = search.in_rank_order(events, ranked.items)
+            return KeysetPage(rows, ranked.next_cursor, ranked.previous_cursor)
         events = events.filter(
             Q(name__icontains=query) | Q(location__icontains=query)
         )
+    return paginate_request(request, events, ("date", "time", "id"))
+
+
+def home_grid_params(request, query):
+    """The inputs the home grid depends on: the stripped query and the page cursors."""
+    params = QueryDict(mutable=True)
+    for name, value in (("q", query), ("after", request.GET.get("after")), ("before", request.GET.get("before"))):
+        if value:
+            params[name] = value
+    return params
+
+
+def home(request):
+    query = request.GET.get('q', '').strip()  #
+
+    if wants_json(request):
+        page = home_events(request, Event.objects.values(*EVENT_CARD_FIELDS), query)
+        return json_page(page, event_card_json)
+
+    # The grid only changes when events do, so it is rendered once per
+    # events generation and search/page and then served from the cache.
+    # Other parameters (tracking tags and such) do not split the cache.
+    params = home_grid_params(request, query)
+    key = fragment_key("home-grid", params)
+    grid = cache.get(key)
+    if grid is None:
+        page = home_events(request, Event.objects.all(), query)
+        # The pagination links ({% querystring %}) are built from the keyed
+        # parameters only, or the first visitor's extras would be cached
+        # into every later visitor's links.
+        grid_request = copy.copy(request)
+        grid_request.GET = params
+        grid = render_to_string('event_grid.html', {'events': page, 'page': page}, request=grid_request)
+        cache.set(key, grid, getattr(settings, "HOME_GRID_CACHE_TIMEOUT", 60 * 10))
 
     context = {
-        'events': events,
+        'grid': grid,
         'query': query,
     }
     return render(request, 'home.html', context)
@@ -56,62 +109,40 @@ def home(request):
 
 @login_required
 @user_passes_test(is_organizer_or_admin,login_url=('no_permission'))
+@query_budget(4)
 def organizer_dashboard(request):
-    now = timezone.localtime()
-    today = now.date()
-    now_time = now.time()
-
- 
-    upcoming_filter = Q(date__gt=today) | (Q(date=today) & Q(time__gte=now_time))
-    past_filter = Q(date__lt=today) | (Q(date=today) & Q(time__lt=now_time))
-
-    
-    base_qs = (
-        Event.objects
-        .select_related("category")
-        .prefetch_related("participants")
-        .annotate(num_participants=Count("participants", distinct=True))
-    )
+    timeline = Timeline()
 
     list_type = request.GET.get("type", "all")
-    if list_type == "upcoming":
-        events = base_qs.filter(upcoming_filter)
-    elif list_type == "past":
-        events = base_qs.filter(past_filter)
-    else:
-        events = base_qs
-
     category_id = request.GET.get("category")
-    if category_id:
-        events = events.filter(category_id=category_id)
+    events = apply_event_filters(Event.objects.select_related("category"), request.GET, timeline)
 
-    start_date = request.GET.get("start_date")
-    end_date = request.GET.get("end_date")
-    if start_date and end_date:
-        events = events.filter(date__range=[start_date, end_date])
+    if wants_json(request):
+        page = paginate_request(
+            request,
+            events.values("id", "name", "date", "time", "location", "category__name", "participant_count"),
+            ("-date", "-time", "-id"),
+        )
+        return json_page(page)
 
-    # Today’s events
-    todays_events = base_qs.filter(date=today).order_by("time")
+    page = paginate_request(request, events, ("-date", "-time", "-id"))
 
-    
-    aggregated = base_qs.aggregate(
-        total_events=Count("id", distinct=True),
-        total_participants_all_events_sum=Sum("num_participants")
+    # All counters in a single conditional-aggregation query
+    counts = Event.objects.aggregate(
+        **timeline.counters("events"),
+        total_participants_all_events_sum=Coalesce(Sum("participant_count"), 0),
     )
+    counts["total_participants_distinct"] = User.objects.count()
 
-    total_participants_distinct = User.objects.count()
-    upcoming_events_count = base_qs.filter(upcoming_filter).count()
-    past_events_count = base_qs.filter(past_filter).count()
+    # Today’s events, skipped when the counters say there are none
+    todays_events = []
+    if counts["today_events"]:
+        todays_events = Event.objects.select_related("category").filter(timeline.today()).order_by("time")
 
     context = {
-        "counts": {
-            "total_events": aggregated["total_events"],
-            "upcoming_events": upcoming_events_count,
-            "past_events": past_events_count,
-            "total_participants_distinct": total_participants_distinct,
-            "total_participants_all_events_sum": aggregated["total_participants_all_events_sum"] or 0,
-        },
-        "events": events.order_by("-date", "-time"),
+        "counts": counts,
+        "events": page,
+        "page": page,
         "todays_events": todays_events,
         "list_type": list_type,
         "categories": Category.objects.all(),
@@ -122,6 +153,32 @@ def organizer_dashboard(request):
 
 
 
+@login_required
+@user_passes_test(is_organizer_or_admin,login_url=('no_permission'))
+def export_events(request):
+    # Same filters as organizer_dashboard, every page at once.
+    events = apply_event_filters(Event.objects.all(), request.GET).order_by("-date", "-time", "-id")
+    return exports.csv_response(
+        "events.csv",
+        ["id", "name", "category", "date", "time", "location", "participants", "capacity"],
+        events.values_list(
+            "id", "name", "category__name", "date", "time", "location", "participant_count", "capacity",
+        ),
+    )
+
+
+@login_required
+@user_passes_test(is_organizer_or_admin,login_url=('no_permission'))
+def export_attendees(request, id):
+    event = get_object_or_404(Event.objects.only("id"), id=id)
+    attendees = User.objects.filter(rsvp_events=event).order_by("id")
+    return exports.csv_response(
+        f"event-{event.id}-attendees.csv",
+        ["id", "username", "first_name", "last_name", "email"],
+        attendees.values_list("id", "username", "first_name", "last_name", "email"),
+    )
+
+
 @login_required
 @permission_required("events.add_event", login_url='no_permission')
 def create_event(request):
@@ -154,6 +211,8 @@ def update_event(request, id):
         event_form = EventModelForm(request.POST, request.FILES, instance=event)
         if event_form.is_valid():
             event_form.save()
+            # A raised capacity frees seats for the waitlist.
+            rsvp.promote_waitlist(event.id)
             messages.success(request, "Event Updated Successfully")
             return redirect('update_event',id)
         else:
@@ -208,22 +267,26 @@ def event_detail(request, id):
 
         # RSVP
         if action == "rsvp":
-            if user_rsvp:
+            status = rsvp.rsvp(event.id, request.user)
+            if status == rsvp.ALREADY_JOINED:
                 messages.warning(request, "You have already RSVP to this event.")
-                return redirect("event-detail", id=event.id)
-            event.participants.add(request.user)
-
-            messages.success(request, "RSVP successful!")
+            elif status == rsvp.WAITLISTED:
+                messages.info(request, "This event is full. You have been added to the waitlist.")
+            elif status == rsvp.ALREADY_WAITLISTED:
+                messages.warning(request, "You are already on the waitlist.")
+            else:
+                messages.success(request, "RSVP successful!")
             return redirect("event-detail", id=event.id)
 
         # CANCEL RSVP
         elif action == "cancel":
-            if not user_rsvp:
+            status = rsvp.cancel_rsvp(event.id, request.user)
+            if status == rsvp.NOT_JOINED:
                 messages.warning(request, "You are not RSVP to this event.")
-                return redirect("event-detail", id=event.id)
-
-            event.participants.remove(request.user)
-            messages.success(request, "Your RSVP has been cancelled.")
+            elif status == rsvp.LEFT_WAITLIST:
+                messages.success(request, "You have left the waitlist.")
+            else:
+                messages.success(request, "Your RSVP has been cancelled.")
             return redirect("event-detail", id=event.id)
 
         else:
@@ -231,9 +294,14 @@ def event_detail(request, id):
             return redirect("event-detail", id=event.id)
 
 
+    waitlist_position = None
+    if not user_rsvp and event.capacity is not None:
+        waitlist_position = rsvp.waitlist_position(event.id, request.user)
+
     return render(request, "event_details.html", {
         "event": event,
         "user_rsvp": user_rsvp,
+        "waitlist_position": waitlist_position,
     })
 
 
@@ -255,6 +323,34 @@ def add_category(request):
     return render(request, 'dashboard/add_category.html', {'form': form})
 
 
+@login_required
+@permission_required("events.add_event", login_url='no_permission')
+def import_events(request):
+    form = EventImportUploadForm()
+    report = None
+
+    if request.method == "POST":
+        form = EventImportUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data["file"]
+            dry_run = form.cleaned_data["dry_run"]
+            try:
+                file_format = importing.detect_format(upload.name)
+                stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+                report = importing.import_events(importing.read_rows(stream, file_format), dry_run=dry_run)
+            except importing.ImportFormatError as e:
+                messages.error(request, str(e))
+            else:
+                verb = "validated" if dry_run else "imported"
+                messages.success(request, f"{report.imported} events {verb}, {report.failed} rows rejected.")
+
+    context = {
+        "form": form,
+        "report": report,
+    }
+    return render(request, "dashboard/import_events.html", context)
+
+
 
 
 
@@ -1,9 +1,16 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 from events.models import Event,Category
+from users.models import OutgoingEmail
 User = get_user_model()
 # Register your models here.
 admin.site.register(Event)
 admin.site.register(Category)
 admin.site.register(User)
 
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+
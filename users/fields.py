@@ -0,0 +1,139 @@
+"""Form field for picking users out of a large user table.
+
+ModelMultipleChoiceField with a checkbox widget renders one option per
+user in its queryset and posts one value per selected user. UserPickerField
+posts only the change instead: the users picked on the page (<name>_add)
+and the current participants ticked for removal (<name>_remove). Others
+are found through the users.views.user_search endpoint, and the current
+participants are shown a page at a time from the same endpoint, so neither
+the page nor the POST grows with the participant list. Submitted ids are
+checked in one query (per backend parameter limit).
+"""
+from django import forms
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.urls import reverse
+
+from events.pagination import paginate
+from users.search import USER_ORDERING, USER_SEARCH_PAGE_SIZE, event_participants, user_label
+
+User = get_user_model()
+
+LABEL_FIELDS = ("username", "first_name", "last_name")
+
+
+def _ids(values):
+    return [int(pk) for pk in values if str(pk).isdigit()]
+
+
+def _labels(ids):
+    # in_bulk() splits very long id lists to fit the backend's limits.
+    users = User.objects.only(*LABEL_FIELDS).in_bulk(ids)
+    return sorted(
+        ((user.pk, user_label(user.username, user.first_name, user.last_name)) for user in users.values()),
+        key=lambda choice: choice[1],
+    )
+
+
+class UserPickerWidget(forms.Widget):
+    template_name = "widgets/user_picker.html"
+
+    def __init__(self, attrs=None, search_url="user-search"):
+        super().__init__(attrs)
+        self.search_url = search_url
+        # The event whose participants are listed; set by the form when editing.
+        self.event = None
+
+    def value_from_datadict(self, data, files, name):
+        try:
+            getter = data.getlist
+        except AttributeError:
+            getter = lambda key: data.get(key) or []
+        return {"add": getter(f"{name}_add"), "remove": getter(f"{name}_remove")}
+
+    def value_omitted_from_data(self, data, files, name):
+        # An unticked checkbox posts nothing, like CheckboxSelectMultiple.
+        return False
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        value = value if isinstance(value, dict) else {}
+        removed = set(_ids(value.get("remove", [])))
+        current, more = [], None
+        if self.event is not None and self.event.pk:
+            page = paginate(
+                event_participants(User.objects.all(), self.event.pk, self.event.participant_count)
+                .values("id", *LABEL_FIELDS),
+                USER_ORDERING,
+                page_size=USER_SEARCH_PAGE_SIZE,
+            )
+            current = [(row["id"], user_label(*(row[field] for field in LABEL_FIELDS))) for row in page]
+            more = page.next_cursor
+        # Removals ticked on later pages are kept across a re-render.
+        shown = {pk for pk, label in current}
+        current += _labels([pk for pk in removed if pk not in shown])
+        context["widget"].update({
+            "search_url": reverse(self.search_url),
+            "event_id": self.event.pk if self.event is not None else None,
+            "participant_count": self.event.participant_count if self.event is not None else 0,
+            "current": [(pk, label, pk in removed) for pk, label in current],
+            "more": more,
+            "added": _labels(_ids(value.get("add", []))),
+        })
+        return context
+
+
+class UserPickerField(forms.ModelMultipleChoiceField):
+    """Cleans to {"add": [...], "remove": [...]} lists of primary keys.
+
+    Existence of the added users is checked by reading only the key
+    column, one query per backend parameter limit; building a model
+    instance per submitted id cost more than the query itself for large
+    lists. Removed ids only need to be well-formed.
+    """
+
+    widget = UserPickerWidget
+
+    def clean(self, value):
+        value = value if isinstance(value, dict) else {}
+        add, remove = value.get("add") or [], value.get("remove") or []
+        if self.required and not add:
+            raise ValidationError(self.error_messages["required"], code="required")
+        return {"add": self._check_values(add) if add else [], "remove": self._keys(remove)}
+
+    def has_changed(self, initial, data):
+        return bool(data and (data.get("add") or data.get("remove")))
+
+    def _keys(self, value):
+        key = self.to_field_name or "pk"
+        opts = self.queryset.model._meta
+        model_field = opts.pk if key == "pk" else opts.get_field(key)
+        try:
+            submitted = list(dict.fromkeys(value))
+        except TypeError:
+            raise ValidationError(self.error_messages["invalid_list"], code="invalid_list")
+        ids = []
+        for pk in submitted:
+            try:
+                ids.append(model_field.to_python(pk))
+            except ValidationError:
+                raise ValidationError(
+                    self.error_messages["invalid_pk_value"], code="invalid_pk_value", params={"pk": pk},
+                )
+        return ids
+
+    def _check_values(self, value):
+        key = self.to_field_name or "pk"
+        ids = self._keys(value)
+        found = set()
+        batch_size = connections[self.queryset.db].features.max_query_params or len(ids) or 1
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            found.update(self.queryset.filter(**{f"{key}__in": batch}).values_list(key, flat=True))
+        for pk in ids:
+            if pk not in found:
+                raise ValidationError(
+                    self.error_messages["invalid_choice"], code="invalid_choice", params={"value": pk},
+                )
+        return ids
@@ -1,9 +1,10 @@
 from django import forms
-from django.contrib.auth.models import Group, Permission
+from django.contrib.auth.models import Group
 import re
 from django.contrib.auth import get_user_model
 from events.forms import StyledFormMixin
 from django.contrib.auth.forms import AuthenticationForm
+from users.permissions import permission_choices
 
 User=get_user_model()
 
@@ -86,8 +87,11 @@ class AssignRoleForm(StyledFormMixin, forms.Form):
 
 class CreateGroupForm(forms.ModelForm):
 
-    permissions = forms.ModelMultipleChoiceField(
-        queryset=Permission.objects.all(),
+    # Choices come from the cached permission catalog, so neither rendering
+    # nor validating the form queries the permission table.
+    permissions = forms.TypedMultipleChoiceField(
+        choices=permission_choices,
+        coerce=int,
         widget=forms.CheckboxSelectMultiple,
         required=False,
         label="Assign Permissions"
@@ -0,0 +1,77 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+from django.core.management.base import BaseCommand
+from django.db.models.signals import m2m_changed
+from django.test.utils import override_settings
+
+from events.benchmarking import SlowEmailBackend, scratch_database, seed_categories
+from events.models import Event
+from users import outbox
+from users.signals import rsvp_confirmation, send_rsvp_confirmation_email
+
+User = get_user_model()
+
+
+def legacy_rsvp_confirmation(sender, instance, action, reverse, pk_set, **kwargs):
+    """The previous receiver: one lookup and one provider call per user."""
+    if action == "post_add" and not reverse:
+        for user_id in pk_set:
+            user = User.objects.get(pk=user_id)
+            if user.email:
+                subject, message, recipients = rsvp_confirmation(user, instance)
+                send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, recipients, fail_silently=True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time adding participants to an event with the per-user confirmation "
+        "receiver and with the batched outbox one. Runs against a throwaway "
+        "test database with a simulated provider round-trip."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--participants", type=int, default=1000)
+        parser.add_argument("--latency-ms", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        SlowEmailBackend.latency = options["latency_ms"] / 1000
+        backend = f"{SlowEmailBackend.__module__}.{SlowEmailBackend.__name__}"
+
+        # Image variants are made inline so no background writer competes for the database.
+        with scratch_database(), override_settings(EMAIL_BACKEND=backend, EVENT_IMAGE_ASYNC=False):
+            count = options["participants"]
+            User.objects.bulk_create(
+                User(username=f"bench{i}", email=f"bench{i}@example.com") for i in range(count)
+            )
+            user_ids = list(User.objects.values_list("id", flat=True))
+            category_id = seed_categories(1)[0]
+
+            m2m_changed.disconnect(send_rsvp_confirmation_email, sender=Event.participants.through)
+            m2m_changed.connect(legacy_rsvp_confirmation, sender=Event.participants.through)
+            try:
+                before = self.add_participants(category_id, user_ids)
+            finally:
+                m2m_changed.disconnect(legacy_rsvp_confirmation, sender=Event.participants.through)
+                m2m_changed.connect(send_rsvp_confirmation_email, sender=Event.participants.through)
+
+            after = self.add_participants(category_id, user_ids)
+            started = time.perf_counter()
+            while any(outbox.deliver_batch()):
+                pass
+            drain = time.perf_counter() - started
+
+        self.stdout.write(f"Adding {count} participants ({options['latency_ms']:g}ms provider latency):")
+        self.stdout.write(f"  per-user send_mail in request: {before:8.2f}s")
+        self.stdout.write(f"  batched outbox enqueue:        {after:8.2f}s")
+        self.stdout.write(f"  outbox worker drain:           {drain:8.2f}s (off the request path)")
+
+    def add_participants(self, category_id, user_ids):
+        event = Event.objects.create(
+            name="Benchmark", date="2030-01-01", time="10:00", location="Dhaka", category_id=category_id,
+        )
+        started = time.perf_counter()
+        event.participants.add(*user_ids)
+        return time.perf_counter() - started
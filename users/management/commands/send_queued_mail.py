@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users import outbox
+
+
+class Command(BaseCommand):
+    help = "Send the emails waiting in the outbox. Use --loop to run as a worker process."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Default: settings.OUTBOX_BATCH_SIZE.")
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling for new messages instead of exiting once the outbox is empty.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5.0,
+            help="Seconds to sleep between polls when the outbox is empty (with --loop).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = outbox.deliver_batch(options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}.")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
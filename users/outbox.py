@@ -0,0 +1,140 @@
+"""Database-backed outbox for outgoing email.
+
+Request handlers and signal receivers call enqueue_mail(), which only
+inserts an OutgoingEmail row in the current transaction. The
+`send_queued_mail` management command drains the table in batches through
+a single backend connection, retrying failed messages with exponential
+backoff until settings.OUTBOX_MAX_ATTEMPTS is reached. The OUTBOX_*
+settings are read on every call, so override_settings() applies to them.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from events.locking import write_transaction
+from users.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipient_list),
+    )
+
+
+def enqueue_many(messages, from_email=None):
+    """Queue (subject, message, recipient_list) tuples with bulk INSERTs."""
+    from_email = from_email or settings.DEFAULT_FROM_EMAIL
+    return OutgoingEmail.objects.bulk_create(
+        [
+            OutgoingEmail(subject=subject, body=message, from_email=from_email, to=list(recipients))
+            for subject, message, recipients in messages
+        ],
+        batch_size=500,
+    )
+
+
+def backoff(attempts):
+    return timedelta(seconds=getattr(settings, "OUTBOX_BACKOFF_SECONDS", 30) * 2 ** (attempts - 1))
+
+
+def claim_batch(batch_size=None):
+    """Lease up to `batch_size` (default settings.OUTBOX_BATCH_SIZE) due messages to the calling worker."""
+    if batch_size is None:
+        batch_size = getattr(settings, "OUTBOX_BATCH_SIZE", 100)
+    # How long a claimed message stays invisible to other workers; a worker
+    # that dies mid-batch releases its messages once the lease runs out.
+    lease = timedelta(seconds=getattr(settings, "OUTBOX_LEASE_SECONDS", 300))
+    now = timezone.now()
+    due = OutgoingEmail.objects.filter(status=OutgoingEmail.PENDING, next_attempt_at__lte=now)
+    # An idle poll stays a plain read and never waits for the write lock.
+    if not due.exists():
+        return []
+    with write_transaction():
+        batch = list(
+            due.select_for_update(skip_locked=True).order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if batch:
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                next_attempt_at=now + lease
+            )
+    return batch
+
+
+def deliver_batch(batch_size=None):
+    """Send one batch of due messages. Returns (sent, failed) counts."""
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Nothing can go out; put the whole batch back on the retry schedule.
+        for email in batch:
+            _record_failure(email, e)
+        return 0, len(batch)
+
+    messages = [
+        EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            from_email=email.from_email,
+            to=email.to,
+            connection=connection,
+        )
+        for email in batch
+    ]
+    try:
+        try:
+            # The whole batch in one backend call (one API request or one
+            # SMTP session).
+            connection.send_messages(messages)
+        except Exception:
+            # Retry one by one to find the message(s) that failed. Delivery
+            # is at-least-once: messages the backend accepted before the
+            # error may be sent twice.
+            for email, message in zip(batch, messages):
+                try:
+                    connection.send_messages([message])
+                except Exception as e:
+                    _record_failure(email, e)
+                    failed += 1
+                else:
+                    _record_sent([email])
+                    sent += 1
+        else:
+            _record_sent(batch)
+            sent = len(batch)
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _record_sent(emails):
+    OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+        status=OutgoingEmail.SENT, sent_at=timezone.now(),
+        attempts=F("attempts") + 1, last_error="",
+    )
+
+
+def _record_failure(email, error):
+    attempts = email.attempts + 1
+    if attempts >= getattr(settings, "OUTBOX_MAX_ATTEMPTS", 6):
+        logger.error("OUTBOX: giving up on email %s to %s: %s", email.pk, email.to, error)
+        status, next_attempt_at = OutgoingEmail.FAILED, timezone.now()
+    else:
+        logger.warning("OUTBOX: email %s to %s failed (attempt %s): %s", email.pk, email.to, attempts, error)
+        status, next_attempt_at = OutgoingEmail.PENDING, timezone.now() + backoff(attempts)
+    OutgoingEmail.objects.filter(pk=email.pk).update(
+        status=status, attempts=attempts, next_attempt_at=next_attempt_at, last_error=str(error),
+    )
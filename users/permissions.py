@@ -0,0 +1,73 @@
+"""Process-wide catalog of permissions for role-management screens.
+
+Rendering Permission objects one by one pulls each one's content type
+(Permission.__str__ includes it), an N+1 on every page that lists them.
+The catalog reads all permissions once with their content types, groups
+them by app and model, and keeps the result for the life of the process.
+Permissions only change when migrations run, so the post_migrate receiver
+in users.signals clears it, as do edits to a Permission in this process;
+other processes pick up new permissions when they restart after a deploy.
+"""
+import threading
+from collections import namedtuple
+
+from django.apps import apps
+from django.contrib.auth.models import Permission
+
+PermissionGroup = namedtuple("PermissionGroup", ["app_label", "model", "label", "permissions"])
+PermissionEntry = namedtuple("PermissionEntry", ["id", "codename", "name"])
+
+_catalog = None
+_lock = threading.Lock()
+
+
+def _verbose_names(content_type):
+    try:
+        app = apps.get_app_config(content_type.app_label).verbose_name
+    except LookupError:
+        app = content_type.app_label
+    model = content_type.model_class()
+    return app, model._meta.verbose_name if model else content_type.model
+
+
+def _load():
+    permissions = Permission.objects.select_related("content_type").order_by(
+        "content_type__app_label", "content_type__model", "codename",
+    )
+    groups = {}
+    for permission in permissions:
+        content_type = permission.content_type
+        key = (content_type.app_label, content_type.model)
+        if key not in groups:
+            app, model = _verbose_names(content_type)
+            groups[key] = (f"{app} | {model}", [])
+        groups[key][1].append(PermissionEntry(permission.pk, permission.codename, permission.name))
+    return tuple(
+        PermissionGroup(app_label, model, label, tuple(entries))
+        for (app_label, model), (label, entries) in groups.items()
+    )
+
+
+def get_catalog():
+    """Every permission, as PermissionGroups sorted by app label and model."""
+    global _catalog
+    catalog = _catalog
+    if catalog is None:
+        with _lock:
+            if _catalog is None:
+                _catalog = _load()
+            catalog = _catalog
+    return catalog
+
+
+def permission_choices():
+    """Grouped (id, name) choices for a ChoiceField, one group per model."""
+    return [
+        (group.label, [(entry.id, entry.name) for entry in group.permissions])
+        for group in get_catalog()
+    ]
+
+
+def invalidate():
+    global _catalog
+    _catalog = None
@@ -0,0 +1,106 @@
+"""Group-based roles.
+
+A user's group names are memoized on the user object, so the access
+decorators, the views and the user_roles context processor share one lookup
+per request (request.user is the same object for the whole request).
+
+Across requests the names are kept in the default cache under a key made of
+the user id and a global membership version. The receivers in users.signals
+delete a user's entry when their groups change and bump the version when a
+whole group is deleted or renamed, which invalidates every entry at once.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+ADMIN = "admin"
+ORGANIZER = "Organizer"
+PARTICIPANT = "Participant"
+
+VERSION_KEY = "roles:version"
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def role_cache_stats():
+    """Hit/miss counters of the role cache in this process."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / lookups if lookups else None
+    return stats
+
+
+def _membership_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def _cache_key(user_id, version):
+    return f"roles:{version}:{user_id}"
+
+
+def get_role_names(user):
+    if not user.is_authenticated:
+        return frozenset()
+    try:
+        return user._role_names
+    except AttributeError:
+        pass
+
+    key = _cache_key(user.pk, _membership_version())
+    names = cache.get(key)
+    if names is None:
+        _count("misses")
+        names = frozenset(user.groups.values_list("name", flat=True))
+        cache.set(key, names, getattr(settings, "ROLE_CACHE_TIMEOUT", 60 * 60))
+    else:
+        _count("hits")
+    user._role_names = names
+    return names
+
+
+def forget_roles(user):
+    """Drop the memoized group names after changing the user's groups."""
+    try:
+        del user._role_names
+    except AttributeError:
+        pass
+
+
+def invalidate_users(user_ids):
+    version = _membership_version()
+    cache.delete_many([_cache_key(user_id, version) for user_id in user_ids])
+
+
+def invalidate_all():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 2, timeout=None)
+
+
+def is_admin(user):
+    return ADMIN in get_role_names(user)
+
+
+def is_organizer(user):
+    return ORGANIZER in get_role_names(user)
+
+
+def is_participant(user):
+    return PARTICIPANT in get_role_names(user)
+
+
+def is_organizer_or_admin(user):
+    return user.is_superuser or is_organizer(user)
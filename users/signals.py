@@ -1,11 +1,16 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save, m2m_changed
+from django.db.models import F
+from django.db.models.signals import post_save, m2m_changed, pre_delete, post_delete, post_migrate
+from users import permissions, roles
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group
+from django.contrib.auth.models import Group, Permission
 from django.contrib.auth.tokens import default_token_generator
 from django.conf import settings
 from django.urls import reverse
-from django.core.mail import send_mail
+from django.utils import timezone
+from users.outbox import enqueue_mail, enqueue_many
+from events import rsvp
+from events.models import Event
 import logging
 
 User = get_user_model()
@@ -13,7 +18,7 @@ logger = logging.getLogger("django")
 
 @receiver(post_save, sender=User)
 def send_activation_email(sender, instance, created, **kwargs):
-    if created:
+    if created and instance.email:
         logger.warning("SIGNAL: Preparing to send activation email to %s", instance.email)
 
         token = default_token_generator.make_token(instance)
@@ -28,18 +33,8 @@ def send_activation_email(sender, instance, created, **kwargs):
             "Thank you!"
         )
 
-        try:
-            send_mail(
-                subject,
-                message,
-                settings.DEFAULT_FROM_EMAIL,    
-                [instance.email],
-                fail_silently=False,
-            )
-            logger.warning("SIGNAL: Email SENT to %s", instance.email)
-
-        except Exception as e:
-            logger.error("SIGNAL: FAILED to send email to %s — ERROR: %s", instance.email, e)
+        enqueue_mail(subject, message, [instance.email])
+        logger.warning("SIGNAL: Activation email queued for %s", instance.email)
 
 
 @receiver(post_save, sender=User)
@@ -49,27 +44,108 @@ def assign_role(sender, instance, created, **kwargs):
         instance.groups.add(group)
 
 
-@receiver(m2m_changed)
-def send_rsvp_confirmation_email(sender, instance, action, model, pk_set, **kwargs):
-    if action == "post_add" and instance.__class__.__name__ == 'Event' and model == User:
-        for user_id in pk_set:
-            try:
-                user = User.objects.get(pk=user_id)
-            except User.DoesNotExist:
-                continue
-
-            if user.email:
-                event = instance
-
-                send_mail(
-                    subject=f"RSVP Confirmation — {event.name}",
-                    message=(
-                        f"Hi {user.get_full_name() or user.username},\n\n"
-                        f"You successfully RSVP for {event.name}.\n"
-                        f"Date: {event.date}\nTime: {event.time}\nLocation: {event.location}\n"
-                        "Best of Luck."
-                    ),
-                    from_email=settings.DEFAULT_FROM_EMAIL,   
-                    recipient_list=[user.email],
-                    fail_silently=True,
-                )
+def rsvp_confirmation(user, event):
+    return (
+        f"RSVP Confirmation — {event.name}",
+        (
+            f"Hi {user.get_full_name() or user.username},\n\n"
+            f"You successfully RSVP for {event.name}.\n"
+            f"Date: {event.date}\nTime: {event.time}\nLocation: {event.location}\n"
+            "Best of Luck."
+        ),
+        [user.email],
+    )
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_cached_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        roles.invalidate_users([instance.pk])
+        roles.forget_roles(instance)
+    elif pk_set:
+        roles.invalidate_users(pk_set)
+    else:
+        # group.user_set.clear() does not say which users were affected.
+        roles.invalidate_all()
+
+
+@receiver(post_save, sender=Group)
+def invalidate_roles_on_group_rename(sender, instance, created, **kwargs):
+    if not created:
+        roles.invalidate_all()
+
+
+@receiver(post_delete, sender=Group)
+def invalidate_roles_on_group_delete(sender, instance, **kwargs):
+    roles.invalidate_all()
+
+
+@receiver(post_migrate)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def reset_permission_catalog(sender, **kwargs):
+    permissions.invalidate()
+
+
+@receiver(m2m_changed, sender=Event.participants.through)
+def send_rsvp_confirmation_email(sender, instance, action, reverse, pk_set, **kwargs):
+    if action != "post_add" or not pk_set:
+        return
+
+    # One query for the other side of the relation and one INSERT for all
+    # the confirmations, however many participants were added.
+    if reverse:
+        pairs = [(instance, event) for event in Event.objects.in_bulk(pk_set).values()]
+    else:
+        users = User.objects.only("username", "first_name", "last_name", "email").in_bulk(pk_set)
+        pairs = [(user, instance) for user in users.values()]
+
+    enqueue_many(rsvp_confirmation(user, event) for user, event in pairs if user.email)
+
+
+@receiver(m2m_changed, sender=Event.participants.through)
+def update_participant_count(sender, instance, action, reverse, pk_set, **kwargs):
+    # post_add's pk_set only holds the rows actually inserted, so it can be
+    # applied as an increment. Removals may name rows that never existed,
+    # so those events are recounted from the through table instead.
+    if action == "post_add" and pk_set:
+        # updated_at moves too: it drives the API's Last-Modified/ETag.
+        if reverse:
+            Event.objects.filter(pk__in=pk_set).update(
+                participant_count=F("participant_count") + 1, updated_at=timezone.now(),
+            )
+        else:
+            Event.objects.filter(pk=instance.pk).update(
+                participant_count=F("participant_count") + len(pk_set), updated_at=timezone.now(),
+            )
+
+    elif action == "pre_clear" and reverse:
+        instance._cleared_event_ids = list(instance.rsvp_events.values_list("pk", flat=True))
+
+    elif action in ("post_remove", "post_clear"):
+        if not reverse:
+            event_ids = [instance.pk]
+        elif action == "post_remove":
+            event_ids = pk_set
+        else:
+            event_ids = getattr(instance, "_cleared_event_ids", [])
+        if event_ids:
+            Event.objects.filter(pk__in=event_ids).recount_participants()
+
+
+@receiver(pre_delete, sender=User)
+def remember_rsvp_events(sender, instance, **kwargs):
+    # Deleting a user cascades to the through table without m2m_changed.
+    instance._rsvp_event_ids = list(instance.rsvp_events.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=User)
+def recount_rsvp_events(sender, instance, **kwargs):
+    event_ids = getattr(instance, "_rsvp_event_ids", [])
+    if event_ids:
+        Event.objects.filter(pk__in=event_ids).recount_participants()
+        # The freed seats go to the waitlists.
+        for event_id in event_ids:
+            rsvp.promote_waitlist(event_id)
@@ -1,3 +1,453 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_migrate
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from events.models import Category, Event
+from events.timeline import Timeline
+from users import outbox, permissions, roles
+from users.forms import CreateGroupForm
+from users.models import OutgoingEmail
+from users.search import USER_ORDERING, search_users
+from users.views import user_dashboard
+
+User = get_user_model()
+
+
+class OutboxTests(TestCase):
+    def drain(self):
+        call_command("send_queued_mail", stdout=StringIO())
+
+    def test_signup_only_enqueues(self):
+        User.objects.create_user("alice", email="alice@example.com")
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.get().to, ["alice@example.com"])
+
+        self.drain()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Activate Your Account")
+        self.assertEqual(OutgoingEmail.objects.get().status, OutgoingEmail.SENT)
+
+    def test_rsvp_confirmation_goes_through_outbox(self):
+        user = User.objects.create_user("bob", email="bob@example.com")
+        event = Event.objects.create(
+            name="Gig", date="2030-01-01", time="20:00", location="Dhaka",
+            category=Category.objects.create(name="Music"),
+        )
+        event.participants.add(user)
+        self.drain()
+        self.assertEqual([m.subject for m in mail.outbox][-1], "RSVP Confirmation — Gig")
+
+    def test_failed_send_is_retried_with_backoff(self):
+        email = outbox.enqueue_mail("Hi", "Body", ["carol@example.com"])
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=ConnectionError("provider down"),
+        ):
+            self.assertEqual(outbox.deliver_batch(), (0, 1))
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        # Not due yet, so the next run leaves it alone.
+        self.assertEqual(outbox.deliver_batch(), (0, 0))
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.deliver_batch(), (1, 0))
+
+    def test_gives_up_after_max_attempts(self):
+        email = outbox.enqueue_mail("Hi", "Body", ["dave@example.com"])
+        OutgoingEmail.objects.update(attempts=settings.OUTBOX_MAX_ATTEMPTS - 1)
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=ConnectionError("provider down"),
+        ):
+            outbox.deliver_batch()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.FAILED)
+
+    def test_settings_are_read_at_call_time(self):
+        for n in range(3):
+            outbox.enqueue_mail("Hi", "Body", [f"fan{n}@example.com"])
+        with override_settings(OUTBOX_BATCH_SIZE=2, OUTBOX_MAX_ATTEMPTS=1):
+            with mock.patch(
+                "django.core.mail.backends.locmem.EmailBackend.send_messages",
+                side_effect=ConnectionError("provider down"),
+            ), self.assertLogs("users.outbox", "ERROR"):
+                self.assertEqual(outbox.deliver_batch(), (0, 2))
+        self.assertEqual(OutgoingEmail.objects.filter(status=OutgoingEmail.FAILED).count(), 2)
+
+
+class RsvpConfirmationTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="Music")
+        self.events = [
+            Event.objects.create(name=name, date="2030-01-01", time="20:00", location="Dhaka", category=category)
+            for name in ("Gig", "Jam")
+        ]
+        self.users = [User.objects.create_user(f"fan{i}", email=f"fan{i}@example.com") for i in range(5)]
+        self.users.append(User.objects.create_user("no_email"))
+        OutgoingEmail.objects.all().delete()
+
+    def confirmations(self):
+        return sorted((email.to[0], email.subject) for email in OutgoingEmail.objects.all())
+
+    def test_one_user_lookup_for_many_participants(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.events[0].participants.add(*self.users)
+        user_reads = [q for q in queries if q["sql"].startswith('SELECT "users_customuser"')]
+        self.assertEqual(len(user_reads), 1)
+        self.assertEqual(
+            self.confirmations(), [(f"fan{i}@example.com", "RSVP Confirmation — Gig") for i in range(5)],
+        )
+
+    def test_reverse_side(self):
+        self.users[0].rsvp_events.add(*self.events)
+        self.assertEqual(self.confirmations(), [
+            ("fan0@example.com", "RSVP Confirmation — Gig"), ("fan0@example.com", "RSVP Confirmation — Jam"),
+        ])
+
+
+class OutboxBatchTests(TestCase):
+    def setUp(self):
+        for recipient in ("a@example.com", "bad@example.com", "c@example.com"):
+            outbox.enqueue_mail("Hi", "Body", [recipient])
+
+    def test_batch_goes_out_in_one_call_over_one_connection(self):
+        backend = "django.core.mail.backends.locmem.EmailBackend"
+        with mock.patch(f"{backend}.open", autospec=True) as opened, \
+                mock.patch(f"{backend}.send_messages", autospec=True, return_value=3) as sent:
+            self.assertEqual(outbox.deliver_batch(), (3, 0))
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(sent.call_count, 1)
+        self.assertEqual(len(sent.call_args.args[1]), 3)
+        self.assertFalse(OutgoingEmail.objects.exclude(status=OutgoingEmail.SENT).exists())
+
+    def test_failed_batch_is_retried_one_by_one(self):
+        def send_messages(backend, messages):
+            if len(messages) > 1 or messages[0].to == ["bad@example.com"]:
+                raise ConnectionError("rejected")
+            return 1
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages", autospec=True, side_effect=send_messages,
+        ), self.assertLogs("users.outbox", "WARNING"):
+            self.assertEqual(outbox.deliver_batch(), (2, 1))
+        statuses = {email.to[0]: email.status for email in OutgoingEmail.objects.all()}
+        self.assertEqual(statuses, {
+            "a@example.com": OutgoingEmail.SENT,
+            "bad@example.com": OutgoingEmail.PENDING,
+            "c@example.com": OutgoingEmail.SENT,
+        })
+
+
+class RoleCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("erin")
+        self.organizers = Group.objects.create(name=roles.ORGANIZER)
+
+    def fresh_user(self):
+        # A new object per "request", like the one AuthenticationMiddleware loads.
+        return User.objects.get(pk=self.user.pk)
+
+    def test_group_names_are_cached_across_requests(self):
+        self.user.groups.add(self.organizers)
+        self.assertTrue(roles.is_organizer(self.fresh_user()))
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(roles.is_organizer(user))
+            self.assertFalse(roles.is_admin(user))
+
+    @override_settings(ROLE_CACHE_TIMEOUT=0)
+    def test_timeout_is_read_at_call_time(self):
+        roles.is_organizer(self.fresh_user())
+        user = self.fresh_user()
+        with CaptureQueriesContext(connection) as queries:
+            roles.is_organizer(user)
+        self.assertTrue(queries)
+
+    def test_membership_changes_invalidate(self):
+        self.assertFalse(roles.is_organizer(self.fresh_user()))
+        self.organizers.user_set.add(self.user)
+        self.assertTrue(roles.is_organizer(self.fresh_user()))
+        self.user.groups.remove(self.organizers)
+        self.assertFalse(roles.is_organizer(self.fresh_user()))
+
+    def test_group_delete_invalidates(self):
+        self.user.groups.add(self.organizers)
+        self.assertTrue(roles.is_organizer(self.fresh_user()))
+        self.organizers.delete()
+        self.assertFalse(roles.is_organizer(self.fresh_user()))
+
+
+class UserDashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("frank")
+        category = Category.objects.create(name="Music")
+        today = timezone.localdate()
+        self.events = [
+            Event.objects.create(
+                name=f"Event {offset}", date=today + timedelta(days=offset), time="12:00",
+                location="Dhaka", category=category,
+            )
+            for offset in (-3, -1, 2, 5, 9)
+        ]
+        for event in self.events:
+            event.participants.add(self.user)
+        # Memoize the role lookup the context processor makes.
+        roles.get_role_names(self.user)
+
+    def get(self, **params):
+        request = RequestFactory().get("/users/dashboard/", params)
+        request.user = self.user
+        return user_dashboard(request)
+
+    def test_dashboard_costs_two_queries(self):
+        with self.assertNumQueries(2):
+            response = self.get()
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(2):
+            self.get(type="upcoming")
+
+    def client_get(self, **params):
+        self.client.force_login(self.user)
+        return self.client.get("/users/dashboard/", params)
+
+    def test_counters(self):
+        self.events[0].date = timezone.localdate()
+        self.events[0].save()
+        response = self.client_get()
+        counts = response.context["counts"]
+        self.assertEqual(counts["total_rsvp"], 5)
+        self.assertEqual(counts["upcoming_rsvp"] + counts["past_rsvp"], 5)
+        self.assertEqual(counts["today_rsvp"], 1)
+        self.assertEqual([e.pk for e in response.context["todays_events"]], [self.events[0].pk])
+
+    def test_events_today_cost_no_extra_query(self):
+        category = self.events[0].category
+        today = [
+            Event.objects.create(
+                name=f"Today {time}", date=timezone.localdate(), time=time, location="Dhaka", category=category,
+            )
+            for time in ("23:59:59", "00:00:00")
+        ]
+        for event in today:
+            event.participants.add(self.user)
+        with self.assertNumQueries(2):
+            response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Today 00:00:00")
+        self.assertContains(response, "Today 23:59:59")
+        counts, todays_events = Timeline().counters_with_today(Event.objects.filter(participants=self.user), "rsvp")
+        self.assertEqual(counts, {"total_rsvp": 7, "upcoming_rsvp": 4, "past_rsvp": 3, "today_rsvp": 2})
+        self.assertEqual([e.pk for e in todays_events], [today[1].pk, today[0].pk])
+
+    def test_no_rsvps(self):
+        self.user.rsvp_events.clear()
+        response = self.client_get()
+        self.assertEqual(response.context["counts"]["total_rsvp"], 0)
+        self.assertEqual(list(response.context["todays_events"]), [])
+
+
+class UserSearchTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user("organizer")
+        organizer.groups.add(Group.objects.create(name="Organizer"))
+        self.client.force_login(organizer)
+        User.objects.create_user("jsmith", first_name="John", last_name="Smith", email="john@example.com")
+        User.objects.create_user("jdoe", first_name="Jane", last_name="Doe", email="jane@example.org")
+        User.objects.create_user("smithers", email="waylon@example.com")
+
+    def search(self, query, **params):
+        response = self.client.get(reverse("user-search"), {"q": query, **params})
+        return response.json()
+
+    def test_prefix_search_on_every_field(self):
+        labels = lambda page: [user["label"] for user in page["results"]]
+        self.assertEqual(labels(self.search("SMI")), ["John Smith (jsmith)", "smithers"])
+        self.assertEqual(labels(self.search("john sm")), ["John Smith (jsmith)"])
+        self.assertEqual(labels(self.search("jane@")), ["Jane Doe (jdoe)"])
+        self.assertEqual(labels(self.search("mith")), [])
+
+    def test_results_are_paged(self):
+        for i in range(25):
+            User.objects.create_user(f"fan{i:02}")
+        first = self.search("fan")
+        self.assertEqual(len(first["results"]), 20)
+        rest = self.search("fan", after=first["next"])
+        self.assertEqual([user["label"] for user in rest["results"]], [f"fan{i}" for i in range(20, 25)])
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output")
+    def test_search_uses_the_lower_indexes(self):
+        plan = search_users(User.objects.all(), "smi").order_by(*USER_ORDERING).explain()
+        self.assertIn("user_username_lower_idx", plan)
+        self.assertNotRegex(plan, r"SCAN users_customuser\b")
+
+    def test_participants_cannot_search(self):
+        self.client.force_login(User.objects.get(username="jdoe"))
+        self.assertEqual(self.client.get(reverse("user-search")).status_code, 302)
+
+
+class PermissionCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        admin = User.objects.create_user("root")
+        admin.groups.add(Group.objects.create(name=roles.ADMIN))
+        self.client.force_login(admin)
+        permissions.invalidate()
+
+    def permission_queries(self, request):
+        with CaptureQueriesContext(connection) as queries:
+            response = request()
+        return response, [q["sql"] for q in queries if "auth_permission" in q["sql"]]
+
+    def test_create_group_reads_permissions_once(self):
+        url = reverse("create-group")
+        response, first = self.permission_queries(lambda: self.client.get(url))
+        self.assertEqual(len(first), 1)
+        self.assertContains(response, "Can add event")
+        self.assertEqual(self.permission_queries(lambda: self.client.get(url))[1], [])
+
+        add_event = Permission.objects.get(codename="add_event")
+        data = {"name": "Editors", "permissions": [add_event.pk]}
+        form = CreateGroupForm(data)
+        valid, queries = self.permission_queries(form.is_valid)
+        self.assertTrue(valid)
+        self.assertEqual(queries, [])
+        response = self.client.post(url, data)
+        self.assertRedirects(response, reverse("show-groups"), fetch_redirect_response=False)
+        self.assertEqual(list(Group.objects.get(name="Editors").permissions.all()), [add_event])
+
+    def test_catalog_is_grouped_and_invalidated(self):
+        labels = [group.label for group in permissions.get_catalog()]
+        self.assertIn("Events | event", labels)
+        content_type = ContentType.objects.get_for_model(Event)
+        Permission.objects.create(codename="export_event", name="Can export event", content_type=content_type)
+        event_group = next(group for group in permissions.get_catalog() if group.model == "event")
+        self.assertIn("export_event", [entry.codename for entry in event_group.permissions])
+        app_config = django_apps.get_app_config("users")
+        post_migrate.send(
+            sender=app_config, app_config=app_config, verbosity=0, interactive=False,
+            using="default", apps=django_apps, plan=[],
+        )
+        self.assertIsNone(permissions._catalog)
+
+
+
+class AdminDirectoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_group = Group.objects.create(name=roles.ADMIN)
+        self.organizers = Group.objects.create(name="Organizer")
+        self.admin = User.objects.create_user("root")
+        self.admin.groups.add(self.admin_group)
+        self.client.force_login(self.admin)
+
+    def directory(self, **params):
+        return self.client.get(reverse("admin-dashboard"), params)
+
+    def test_query_count_does_not_grow_with_users(self):
+        self.directory()
+        with CaptureQueriesContext(connection) as few:
+            self.directory()
+        for i in range(60):
+            User.objects.create_user(f"member{i:02}").groups.set([self.organizers])
+        with CaptureQueriesContext(connection) as many:
+            response = self.directory()
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(len(response.context["users"]), 50)
+        self.assertEqual(response.context["users"].items[0].groups_name, "Organizer")
+
+    def test_filters(self):
+        User.objects.create_user("jsmith", first_name="John").groups.set([self.organizers])
+        User.objects.create_user("jdoe", is_active=False)
+        usernames = lambda response: [user.username for user in response.context["users"]]
+        self.assertEqual(usernames(self.directory(group=self.organizers.pk)), ["jsmith"])
+        self.assertEqual(usernames(self.directory(active="0")), ["jdoe"])
+        self.assertEqual(usernames(self.directory(q="j", active="1")), ["jsmith"])
+        self.assertEqual(usernames(self.directory(group=self.admin_group.pk)), ["root"])
+
+    def test_delete_does_not_list_users(self):
+        victim = User.objects.create_user("victim")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("admin-dashboard"), {"action": "delete_user", "user_id": victim.pk})
+        self.assertRedirects(response, reverse("admin-dashboard"), fetch_redirect_response=False)
+        self.assertFalse(User.objects.filter(pk=victim.pk).exists())
+        unfiltered = [q["sql"] for q in queries if 'FROM "users_customuser"' in q["sql"] and "WHERE" not in q["sql"]]
+        self.assertEqual(unfiltered, [])
+
+    def test_every_post_redirects_without_listing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("admin-dashboard"), {"action": "bogus"})
+        self.assertRedirects(response, reverse("admin-dashboard"), fetch_redirect_response=False)
+        self.assertFalse([q["sql"] for q in queries if "ORDER BY" in q["sql"]])
+
+    def test_large_group_filter(self):
+        for i in range(3):
+            User.objects.create_user(f"member{i}").groups.set([self.organizers])
+        for small_group in (10_000, 1):
+            with self.subTest(small_group=small_group), mock.patch("users.search.SMALL_GROUP", small_group):
+                response = self.directory(group=self.organizers.pk, q="mem")
+                self.assertEqual(
+                    [user.username for user in response.context["users"]], ["member0", "member1", "member2"],
+                )
+
+
+class GroupBrowserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user("root")
+        self.admin.groups.add(Group.objects.create(name=roles.ADMIN))
+        self.client.force_login(self.admin)
+        self.everyone = Group.objects.get(name="User")
+        self.url = reverse("show-groups")
+
+    def test_counts_without_loading_members(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+        for i in range(30):
+            User.objects.create_user(f"member{i:02}")
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+        self.assertEqual(len(many), len(few))
+        counts = {group.name: group.member_count for group in response.context["groups"]}
+        self.assertEqual(counts, {roles.ADMIN: 1, "User": 31})
+        self.assertNotIn("members", response.context)
+
+    def test_members_are_paged_and_searchable(self):
+        for i in range(55):
+            User.objects.create_user(f"member{i:02}")
+        # Both plans: joined through the memberships, and probed per user.
+        for small_group in (10_000, 0):
+            with self.subTest(small_group=small_group), mock.patch("users.search.SMALL_GROUP", small_group):
+                response = self.client.get(self.url, {"group": self.everyone.pk})
+                self.assertEqual(len(response.context["members"]), 50)
+                self.assertTrue(response.context["members"].has_next)
+                response = self.client.get(self.url, {"group": self.everyone.pk, "q": "member5"})
+                self.assertEqual([user.username for user in response.context["members"]],
+                                 [f"member5{i}" for i in range(5)])
+
+    def test_remove_user(self):
+        target = User.objects.create_user("target")
+        response = self.client.post(self.url, {"action": "remove_user", "group_id": self.everyone.pk,
+                                               "user_id": target.pk})
+        self.assertRedirects(response, f"{self.url}?group={self.everyone.pk}", fetch_redirect_response=False)
+        self.assertFalse(target.groups.exists())
@@ -1,5 +1,5 @@
 from django.urls import path
-from users.views import sign_up, sign_in, sign_out,admin_dashboard, assign_role, create_group,show_groups,activate_user,no_permission,user_dashboard
+from users.views import sign_up, sign_in, sign_out,admin_dashboard, assign_role, create_group,show_groups,activate_user,no_permission,user_dashboard,role_cache_metrics,user_search
 
 
 
@@ -17,6 +17,8 @@ urlpatterns = [
     path('assign_role/<int:user_id>/', assign_role, name='assign-role'),
     path('create_group/', create_group, name='create-group'),
     path('show_groups/', show_groups, name='show-groups'),
+    path('metrics/role-cache/', role_cache_metrics, name='role-cache-metrics'),
+    path('search/', user_search, name='user-search'),
 
 
     #For User path
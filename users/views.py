@@ -1,24 +1,26 @@
 from django.shortcuts import render, redirect, get_object_or_404, HttpResponse
+from django.http import JsonResponse
 from users.forms import CustomRegistrationForm, LoginForm, AssignRoleForm, CreateGroupForm
 from django.contrib import messages
 from django.contrib.auth import  login,logout,get_user_model 
 from django.contrib.auth.models import  Group 
-from django.db.models import Prefetch
 from django.contrib.auth.tokens import default_token_generator
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.utils import timezone
+from users.roles import is_admin, is_organizer_or_admin, forget_roles, role_cache_stats
+from users.search import (
+    USER_ORDERING, USER_SEARCH_PAGE_SIZE, event_participants, filter_directory, group_members, member_count,
+    primary_group_name, search_users, user_label,
+)
+from events.models import Event
+from events.pagination import paginate_request, wants_json, json_page
+from events.timeline import Timeline
 
 User = get_user_model()
 
+ADMIN_DIRECTORY_PAGE_SIZE = 50
+GROUP_MEMBERS_PAGE_SIZE = 50
 
-def is_admin(user):
-    return user.groups.filter(name='admin').exists()
-
-def is_organizer(user):
-    return user.groups.filter(name='Organizer').exists()
-
-def is_participant(user):
-    return user.groups.filter(name='Participant').exists()
 
 '''User Register'''
 
@@ -82,17 +84,6 @@ def activate_user(request, user_id, token):
 
 @user_passes_test(is_admin, login_url='no_permission')
 def admin_dashboard(request):
-    users = User.objects.prefetch_related(
-        Prefetch('groups', queryset=Group.objects.all(), to_attr='all_groups')
-    ).all()
-
-
-    for user in users:
-        if getattr(user, 'all_groups', None):
-            user.groups_name = user.all_groups[0].name
-        else:
-            user.groups_name = "No Group Assigned"
-
     if request.method == "POST":
         action = request.POST.get("action")
 
@@ -122,7 +113,27 @@ def admin_dashboard(request):
             messages.success(request, f"User '{username}' deleted successfully.")
             return redirect('admin-dashboard')
 
-    return render(request, 'admin/dashboard.html', {"users": users})
+        messages.error(request, "Unknown action.")
+        return redirect('admin-dashboard')
+
+    # One page of the filtered directory, each user's role resolved in SQL.
+    users = filter_directory(User.objects.all(), request.GET).annotate(groups_name=primary_group_name())
+    page = paginate_request(
+        request,
+        users.only("id", "username", "first_name", "last_name", "email", "is_active"),
+        USER_ORDERING,
+        page_size=ADMIN_DIRECTORY_PAGE_SIZE,
+    )
+
+    context = {
+        "users": page,
+        "page": page,
+        "groups": Group.objects.order_by("name").values("id", "name"),
+        "query": request.GET.get("q", ""),
+        "selected_group": request.GET.get("group", ""),
+        "selected_active": request.GET.get("active", ""),
+    }
+    return render(request, 'admin/dashboard.html', context)
 
 
 
@@ -137,6 +148,8 @@ def assign_role(request, user_id):
             role = form.cleaned_data.get('role')  
             user.groups.clear()
             user.groups.add(role)
+            if user.pk == request.user.pk:
+                forget_roles(request.user)
             messages.success(request, f"User {user.username} assigned to role {role.name}.")
             return redirect('admin-dashboard')
 
@@ -183,25 +196,77 @@ def show_groups(request):
             group_id = request.POST.get("group_id")
             user_id = request.POST.get("user_id")
             group = get_object_or_404(Group, id=group_id)
-            target = get_object_or_404(User, id=user_id)
+            target = get_object_or_404(
+                User.objects.only("username", "first_name", "last_name", "is_superuser"), id=user_id
+            )
 
  
             if target.is_superuser:
                 messages.error(request, "Cannot remove a superuser from this group .")
             else:
                 target.groups.remove(group)
+                if target.pk == request.user.pk:
+                    forget_roles(request.user)
                 messages.success(
                     request,
                     f"{target.get_full_name() or target.username} removed from group '{group.name}'."
                 )
-            return redirect("show-groups")
+            return redirect(f"{reverse('show-groups')}?group={group.pk}")
 
         messages.error(request, "Unknown action.")
         return redirect("show-groups")
 
 
-    groups = Group.objects.prefetch_related("user_set").all()
-    return render(request, "admin/show_groups.html", {"groups": groups})
+    # Member counts in one aggregate query; members are listed for one group at a time.
+    groups = Group.objects.annotate(member_count=member_count()).order_by("name")
+    context = {"groups": groups, "open_group": None, "query": request.GET.get("q", "")}
+    group_id = request.GET.get("group", "")
+    open_group = next((group for group in groups if str(group.pk) == group_id), None)
+    if open_group:
+        members = group_members(User.objects.all(), open_group.pk, open_group.member_count)
+        members = search_users(members, context["query"])
+        context["open_group"] = open_group.pk
+        context["members"] = paginate_request(
+            request,
+            members.only("id", "username", "first_name", "last_name", "email"),
+            USER_ORDERING,
+            page_size=GROUP_MEMBERS_PAGE_SIZE,
+        )
+    return render(request, "admin/show_groups.html", context)
+
+
+
+@user_passes_test(is_admin, login_url='no_permission')
+def role_cache_metrics(request):
+    return JsonResponse(role_cache_stats())
+
+
+
+def serialize_user(row):
+    label = user_label(row["username"], row["first_name"], row["last_name"])
+    return {"id": row["id"], "label": label, "email": row["email"]}
+
+
+@login_required
+@user_passes_test(is_organizer_or_admin, login_url='no_permission')
+def user_search(request):
+    """Users matching ?q= for the participant picker, a page at a time.
+
+    ?event=<id> narrows the search to that event's participants.
+    """
+    users = User.objects.all()
+    event_id = request.GET.get("event", "")
+    if event_id.isdigit():
+        event = get_object_or_404(Event.objects.only("participant_count"), pk=event_id)
+        users = event_participants(users, event.pk, event.participant_count)
+    users = search_users(users, request.GET.get("q", ""))
+    page = paginate_request(
+        request,
+        users.values("id", "username", "first_name", "last_name", "email"),
+        USER_ORDERING,
+        page_size=USER_SEARCH_PAGE_SIZE,
+    )
+    return json_page(page, serialize_user)
 
 
 
@@ -223,43 +288,32 @@ def participant_dashboard(request):
 
 @login_required
 def user_dashboard(request):
-    user = request.user
-
-    today = timezone.localdate()
-    now = timezone.now().time()
+    timeline = Timeline()
 
     # Events user RSVP to
-    rsvp_events = user.rsvp_events.all()
-
-   
-    counts = {
-        "total_rsvp": rsvp_events.count(),
-        "upcoming_rsvp": rsvp_events.filter(date__gt=today).count()
-                           + rsvp_events.filter(date=today, time__gte=now).count(),
-        "past_rsvp": rsvp_events.filter(date__lt=today).count()
-                       + rsvp_events.filter(date=today, time__lt=now).count(),
-        "today_rsvp": rsvp_events.filter(date=today).count(),
-    }
+    rsvp_events = Event.objects.filter(participants=request.user)
 
     # Filter by URL query (all | upcoming | past)
     list_type = request.GET.get("type", "all")
+    events = timeline.filter(rsvp_events, list_type).select_related("category")
 
-    if list_type == "upcoming":
-        events = rsvp_events.filter(date__gt=today) | rsvp_events.filter(date=today, time__gte=now)
-    elif list_type == "past":
-        events = rsvp_events.filter(date__lt=today) | rsvp_events.filter(date=today, time__lt=now)
-    else:
-        events = rsvp_events
+    if wants_json(request):
+        page = paginate_request(
+            request,
+            events.values("id", "name", "date", "time", "location", "category__name"),
+            ("date", "time", "id"),
+        )
+        return json_page(page)
 
-    events = events.order_by("date", "time")
+    page = paginate_request(request, events, ("date", "time", "id"))
 
-    # Today's events
-    todays_events = rsvp_events.filter(date=today).order_by("time")
+    # All counters and today's events in a single query
+    counts, todays_events = timeline.counters_with_today(rsvp_events, "rsvp")
 
     return render(request, "users/user_dashboard.html", {
         "counts": counts,
-        "events": events,
+        "events": page,
+        "page": page,
         "list_type": list_type,
         "todays_events": todays_events,
     })
-